@@ -1,14 +1,28 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.naive_bayes import MultinomialNB
+import tkinter.font as tkfont
 import numpy as np
+from scipy import sparse
 import random
 import sqlite3
 import os
 import datetime
 import csv
+import json
 import math
+import re
+import sys
+import argparse
+import threading
+import time
+import hashlib
+import collections
+import functools
+import zlib
+import tempfile
+import platform
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 
 # Define colors for a vibrant kids' app
 COLORS = {
@@ -29,6 +43,939 @@ FONTS = {
     "small": ("Comic Sans MS", 12)
 }
 
+class FontRegistry:
+    """Creates each font once so every widget shares the same Font object"""
+    def __init__(self):
+        self.fonts = {}
+    
+    def get(self, spec):
+        """Return the shared Font for a FONTS name or a font tuple such as ("Arial", 32)"""
+        font = self.fonts.get(spec)
+        if font is None:
+            font = tkfont.Font(font=FONTS[spec] if isinstance(spec, str) else spec)
+            self.fonts[spec] = font
+        return font
+
+# The registry shared by the whole app (fonts are created after the Tk root exists)
+FONT_REGISTRY = FontRegistry()
+
+def get_font(spec):
+    """Shortcut for FONT_REGISTRY.get"""
+    return FONT_REGISTRY.get(spec)
+
+# Challenges students can complete. Each one counts the events named in
+# "event" ("detect" or "train") and awards "bonus" points at its goal
+CHALLENGES = {
+    "detect_5_in_a_row": {"event": "detect", "goal": 5, "bonus": 50},
+    "train_10_examples": {"event": "train", "goal": 10, "bonus": 50}
+}
+
+# Location of the SQLite database shared by every page
+DB_PATH = 'data/users.db'
+
+# Settings for online snapshots of the database
+BACKUP_SETTINGS = {
+    "directory": "backups",   # Where snapshots are written
+    "interval_minutes": 30,   # Time between scheduled backups (0 disables them)
+    "keep": 10,               # Number of snapshots kept before the oldest is deleted
+    "pages_per_step": 64,     # Pages copied per step, so writers are never locked out for long
+    "step_pause": 0.02        # Seconds to wait between steps
+}
+
+# Settings for where the database lives while the app runs
+DATABASE_SETTINGS = {
+    # Keep every table in RAM and save it to DB_PATH on a timer.
+    # Clicks never wait for the disk, but after a crash or power loss the
+    # work done since the last save is gone
+    "in_memory": False,
+    # In-memory mode only: seconds between saves to disk, which is the most
+    # work that can be lost. 0 saves only when the app exits
+    "save_interval_seconds": 60,
+    # In-memory mode only: pages written per step of a timed save and the seconds
+    # to wait between steps, so a slow SD card is never kept busy for long
+    "save_pages_per_step": 64,
+    "save_step_pause": 0.02,
+    # How long a write waits for another process holding the database lock before it fails
+    "busy_timeout_seconds": 5.0
+}
+
+# Settings for saving points, badges and challenges during a session
+AUTOSAVE_SETTINGS = {
+    "delay_ms": 2000   # Changes within this window are written together in one small update
+}
+
+# Settings for the in-window notification banner
+NOTIFICATION_SETTINGS = {
+    "display_ms": 2500,   # How long a banner stays before it hides by itself
+    "max_lines": 4        # Most messages shown in one banner; older ones are dropped
+}
+
+# Settings for live detection while the student types
+LIVE_DETECTION_SETTINGS = {
+    "debounce_ms": 250   # Pause in typing before EmoBot guesses; earlier keystrokes are cancelled
+}
+
+# Settings for reading long pasted texts sentence by sentence
+LONG_TEXT_SETTINGS = {
+    "min_sentences": 3,       # Texts with at least this many sentences get an emotion timeline
+    "tick_budget_ms": 15,     # Work done between two screen updates, so the window never freezes
+    "max_timeline_rows": 200  # Sentences listed in the timeline; the rest only count towards the result
+}
+
+# Settings for the "EmoBot remembers these examples" panel
+SIMILAR_EXAMPLES_SETTINGS = {
+    "top_k": 3,        # Most similar training examples shown after a detection
+    "max_blocks": 8    # Added row blocks kept before they are merged into one matrix
+}
+
+# How texts are turned into word features. Costs are for a classroom corpus of short sentences;
+# an example of ~10 words stores ~10 non-zeros (~20 with bigrams) in the training matrix
+FEATURE_SETTINGS = {
+    "mode": "tfidf",          # "tfidf": learned vocabulary, refit on every retrain, ~100 bytes per distinct word
+                              # "hashing": words hashed into n_features fixed columns, no vocabulary and no refit,
+                              #   a new example is one transform + one partial model update instead of a full retrain
+                              # "numpy": same as "hashing" without scikit-learn (SciPy is still needed)
+    "min_df": 1,              # tfidf only: drop words seen in fewer examples (2 removes most misspellings)
+    "max_features": None,     # tfidf only: keep only the most frequent words, caps the vocabulary dict
+    "bigrams": False,         # Also use word pairs; roughly 2x non-zeros per example and 3-4x vocabulary
+    "n_features": 2 ** 16,    # hashing only: the model keeps 2 float64 arrays of n_features per emotion,
+                              #   ~1 MB per emotion at 2**16; collisions stay rare below ~10k distinct words
+    "dtype": "float32"        # 8 bytes per non-zero (value + column) instead of 12 with float64
+}
+
+# Built-in examples for emotion detection, extended by what students teach
+SEED_DATA = {
+    "texts": [
+        "I am so happy today!", "This is the best day ever!", "I feel great!",
+        "I am so sad right now.", "This is the worst day.", "I feel terrible.",
+        "I am so angry about this!", "This makes me furious!", "I can't believe this happened.",
+        "The weather is nice today.", "I have no strong feelings about this.", "This is just okay.",
+        "Wow, I didn't expect that!", "This is such a surprise!", "I am shocked!",
+        "I am scared of the dark.", "This is terrifying!", "I feel frightened.",
+        "I am so excited for the trip!", "This is going to be amazing!", "I can't wait!"
+    ],
+    "emotions": [
+        "happy", "happy", "happy",
+        "sad", "sad", "sad",
+        "angry", "angry", "angry",
+        "neutral", "neutral", "neutral",
+        "surprised", "surprised", "surprised",
+        "scared", "scared", "scared",
+        "excited", "excited", "excited"
+    ]
+}
+
+# Emoji for each emotion EmoBot knows; training labels must be one of these
+EMOTION_EMOJIS = {
+    "happy": "😊",
+    "sad": "😢",
+    "angry": "😡",
+    "neutral": "😐",
+    "surprised": "😮",
+    "scared": "😨",
+    "excited": "🎉"
+}
+
+# Which classifier to use, see CLASSIFIER_BACKENDS
+MODEL_SETTINGS = {
+    "backend": "sklearn",     # "numpy" needs no scikit-learn, only NumPy and SciPy;
+                              #   pair it with FEATURE_SETTINGS["mode"] = "numpy"
+    "alpha": 1.0              # Additive smoothing of the word counts
+}
+
+# Configurations compared by "python EmoBot.py evaluate"
+EVALUATION_SETTINGS = {
+    "folds": 5,
+    "seed": 42,
+    "backends": ["sklearn", "numpy"],
+    "features": {             # Name -> changes to FEATURE_SETTINGS
+        "tfidf": {},
+        "tfidf_min_df_2": {"min_df": 2},
+        "tfidf_bigrams": {"bigrams": True},
+        "hashing": {"mode": "hashing"},
+        "numpy_hashing": {"mode": "numpy"}
+    }
+}
+
+# Sizes and repeats for "python EmoBot.py benchmark"
+BENCHMARK_SETTINGS = {
+    "corpus_sizes": [21, 1000, 10000, 100000],   # Training examples
+    "db_sizes": [100, 1000, 10000],              # Students in the database
+    "quick_limit": 10000,                        # --quick skips sizes above this
+    "fit_repeats": 3,
+    "repeats": 200,                              # For predictions, explanations and database calls
+    "batch_size": 256,
+    "baseline": "benchmarks/baseline.json",
+    "tolerance": 0.25,                           # Slower than baseline by more than this is a regression...
+    "min_difference_ms": 0.1,                    # ...and by at least this much, so tiny timings don't flap
+    "seed": 42
+}
+
+# Simulated classroom for "python EmoBot.py loadtest"
+LOAD_TEST_SETTINGS = {
+    "students": 20,              # Each one is its own process
+    "duration_seconds": 60,
+    "think_seconds": 3.0,        # Average pause between a student's actions
+    "actions_per_session": (10, 30),
+    "mix": {                     # Chance of each action between login and the final survey
+        "detect": 0.6,
+        "train": 0.15,
+        "save_state": 0.25
+    },
+    "seed": 42
+}
+
+TOP_WORDS_SETTINGS = {
+    "top_k": 5,          # Words shown per emotion in the Emotion Guide
+    "candidates": 20     # Best words kept per emotion, so most training changes never need a full rescan
+}
+
+DUPLICATE_SETTINGS = {
+    "shingle_size": 4,    # Characters per shingle of the normalized text
+    "num_hashes": 32,     # MinHash signature length
+    "bands": 8,           # LSH bands; num_hashes / bands rows each, so pairs above ~0.6 become candidates
+    "threshold": 0.8,     # Estimated Jaccard similarity at which a new example counts as a duplicate
+    "seed": 42
+}
+
+# Sentence ends: ., ! or ? followed by space, or a line break
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+|\n+")
+
+# Settings for the "EmoBot's Adventure" storyline panel
+STORYLINE_SETTINGS = {
+    "max_lines": 50,       # Lines kept in memory and in the panel; the oldest are dropped
+    "log_history": True    # Also write every storyline line to the interaction event log
+}
+
+# Settings for the interaction event log
+EVENT_LOG_SETTINGS = {
+    "batch_size": 50,           # Events kept in memory before they are written in one transaction
+    "flush_interval_ms": 5000   # Longest time an event waits in memory before it is written
+}
+
+class SharedCacheCursor(sqlite3.Cursor):
+    """Cursor of a SharedCacheConnection; its statements wait for table locks like commits do"""
+    def execute(self, sql, parameters=()):
+        return self.connection.wait_for_lock(super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        # Retried from the start, so the rows must be a list rather than a one-shot iterator.
+        # The table lock is taken on the first row, so a locked call has inserted nothing yet
+        return self.connection.wait_for_lock(super().executemany, sql, list(seq_of_parameters))
+
+class SharedCacheConnection(sqlite3.Connection):
+    """
+    Connection to the in-memory database
+    Shared-cache connections lock whole tables and fail at once with "database table is locked"
+    instead of waiting for the busy timeout, so statements and commits are retried here until it runs out
+    """
+    busy_timeout = DATABASE_SETTINGS["busy_timeout_seconds"]
+
+    def wait_for_lock(self, function, *args):
+        deadline = time.monotonic() + self.busy_timeout
+        delay = 0.001
+        while True:
+            try:
+                return function(*args)
+            except sqlite3.OperationalError as e:
+                if "locked" not in str(e) or time.monotonic() >= deadline:
+                    raise
+            time.sleep(delay)
+            delay = min(delay * 2, 0.05)
+
+    def cursor(self, factory=SharedCacheCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def commit(self):
+        self.wait_for_lock(super().commit)
+
+class MemoryDatabase:
+    """Holds the app database in RAM and saves it to disk with the backup API"""
+    # The in-memory database that connect_db() currently uses, if any
+    active = None
+
+    def __init__(self, path=DB_PATH, settings=DATABASE_SETTINGS):
+        # With no path the database is never loaded or saved, which gives
+        # throwaway databases for experiments and tests
+        self.path = path
+        self.settings = settings
+        self.uri = f"file:emobot_memory_{id(self)}?mode=memory&cache=shared"
+        self.keeper = None
+        self.root = None
+        self.after_id = None
+        self.worker = None
+        self.lock = threading.Lock()
+
+    def open(self):
+        """Create the in-memory database, load it from disk and make it active"""
+        # The shared-cache database lives as long as one connection is open
+        self.keeper = sqlite3.connect(self.uri, uri=True, check_same_thread=False)
+        if self.path and os.path.exists(self.path):
+            disk = sqlite3.connect(self.path)
+            try:
+                disk.backup(self.keeper)
+            finally:
+                disk.close()
+        MemoryDatabase.active = self
+        return self
+
+    def connect(self):
+        """Open another connection to the in-memory database"""
+        conn = sqlite3.connect(self.uri, uri=True, factory=SharedCacheConnection)
+        conn.busy_timeout = self.settings["busy_timeout_seconds"]
+        return conn
+
+    def save(self, pages=-1, pause=0):
+        """Write the in-memory database to disk, pages at a time with a pause in between"""
+        if not self.path or not self.keeper:
+            return
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        def _between_steps(status, remaining, total):
+            if remaining and pause:
+                time.sleep(pause)
+
+        with self.lock:
+            disk = sqlite3.connect(self.path)
+            try:
+                self.keeper.backup(disk, pages=pages, progress=_between_steps)
+            finally:
+                disk.close()
+
+    def start(self, root):
+        """Save to disk on a timer from the Tk event loop"""
+        self.root = root
+        interval_ms = int(self.settings["save_interval_seconds"] * 1000)
+        if interval_ms > 0:
+            self.after_id = root.after(interval_ms, self._scheduled_save)
+
+    def _scheduled_save(self):
+        # Saves run on a worker thread in small steps like DatabaseBackup, so a slow
+        # SD card never holds up the window; a save still running skips this turn
+        if not (self.worker and self.worker.is_alive()):
+            self.worker = threading.Thread(target=self._run_save, daemon=True)
+            self.worker.start()
+        self.start(self.root)
+
+    def _run_save(self):
+        try:
+            self.save(self.settings["save_pages_per_step"], self.settings["save_step_pause"])
+        except Exception as e:
+            print(f"Error saving database: {e}")
+
+    def close(self):
+        """Save one last time and release the in-memory database"""
+        if self.after_id:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+        if self.worker:
+            self.worker.join()
+        try:
+            self.save()
+        finally:
+            self.keeper.close()
+            self.keeper = None
+            if MemoryDatabase.active is self:
+                MemoryDatabase.active = None
+
+def connect_db(path=None, timeout=None):
+    """
+    Open a connection to the app database, in RAM or on disk
+    A path opens another database file instead, e.g. for benchmarks and load tests, and a
+    timeout replaces DATABASE_SETTINGS["busy_timeout_seconds"] for it
+    The database helpers below take a connect argument, so callers can pass
+    functools.partial(connect_db, path, timeout=...) to point them at such a file
+    """
+    if timeout is None:
+        timeout = DATABASE_SETTINGS["busy_timeout_seconds"]
+    if path is None:
+        if MemoryDatabase.active:
+            return MemoryDatabase.active.connect()
+        path = DB_PATH
+    return sqlite3.connect(path, timeout=timeout)
+
+def create_tables(cursor):
+    """Create every table the app uses if it doesn't exist yet"""
+    # Create users table if it doesn't exist
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        first_name TEXT NOT NULL,
+        last_name TEXT NOT NULL,
+        grade TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+
+    # Students are looked up by name and grade at login and when merging
+    cursor.execute('''
+    CREATE INDEX IF NOT EXISTS idx_users_name_grade
+    ON users (first_name, last_name, grade)
+    ''')
+
+    # Create sessions table to track logins
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS sessions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER,
+        login_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    )
+    ''')
+
+    # Create survey_responses table to store pre and post survey answers
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS survey_responses (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER,
+        survey_type TEXT,
+        question TEXT,
+        answer TEXT,
+        submitted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    )
+    ''')
+
+    # Create user_progress table to store final points and badges
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS user_progress (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER,
+        points INTEGER,
+        progress INTEGER,
+        badges TEXT,
+        completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    )
+    ''')
+
+    # Create interaction_events table for every detection and training example
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS interaction_events (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER,
+        event_time TIMESTAMP,
+        action TEXT,
+        text_hash TEXT,
+        emotion TEXT,
+        confidence REAL,
+        latency_ms REAL,
+        details TEXT,
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    )
+    ''')
+
+    # Databases created before the details column was added get it now
+    cursor.execute("PRAGMA table_info(interaction_events)")
+    if "details" not in [col[1] for col in cursor.fetchall()]:
+        cursor.execute("ALTER TABLE interaction_events ADD COLUMN details TEXT")
+
+    cursor.execute('''
+    CREATE INDEX IF NOT EXISTS idx_interaction_events_user_time
+    ON interaction_events (user_id, event_time)
+    ''')
+
+    # Per-student activity timeline for teachers, recreated so it always has the latest columns
+    cursor.execute("DROP VIEW IF EXISTS student_timeline")
+    cursor.execute('''
+    CREATE VIEW student_timeline AS
+    SELECT e.user_id, u.first_name, u.last_name, u.grade, e.event_time,
+           e.action, e.emotion, e.confidence, e.latency_ms, e.details
+    FROM interaction_events e
+    JOIN users u ON u.id = e.user_id
+    ORDER BY e.user_id, e.event_time
+    ''')
+
+    # Create training_examples table with every example taught to EmoBot
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS training_examples (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER,
+        text TEXT NOT NULL,
+        emotion TEXT NOT NULL,
+        added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    )
+    ''')
+
+    # Merges look rows up by student to skip the ones the target already has
+    for table in ("sessions", "survey_responses", "user_progress", "training_examples"):
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_user ON {table} (user_id)")
+
+    # Create user_state table with the latest points, badges and challenges per student
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS user_state (
+        user_id INTEGER PRIMARY KEY,
+        points INTEGER,
+        progress INTEGER,
+        badges TEXT,
+        challenges TEXT,
+        updated_at TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    )
+    ''')
+
+def load_user_state(user_id, connect=connect_db):
+    """Return the saved points, progress, badges and challenges of a student, or None"""
+    conn = connect()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT points, progress, badges, challenges FROM user_state WHERE user_id = ?",
+            (user_id,)
+        )
+        row = cursor.fetchone()
+    finally:
+        conn.close()
+    if not row:
+        return None
+    return {
+        "points": row[0],
+        "progress": row[1],
+        "badges": row[2],
+        "challenges": row[3]
+    }
+
+def save_user_state(user_id, changes, connect=connect_db):
+    """Write only the changed state columns of a student"""
+    columns = list(changes)
+    values = [changes[column] for column in columns]
+    updates = ", ".join(f"{column} = excluded.{column}" for column in columns)
+    conn = connect()
+    try:
+        conn.execute(
+            f"INSERT INTO user_state (user_id, {', '.join(columns)}, updated_at) "
+            f"VALUES (?, {', '.join('?' for _ in columns)}, ?) "
+            f"ON CONFLICT (user_id) DO UPDATE SET {updates}, updated_at = excluded.updated_at",
+            [user_id] + values + [datetime.datetime.now().isoformat(" ")]
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+def login_user(first_name, last_name, grade, connect=connect_db):
+    """Find the student, or add them if they're new, record a session and return their id"""
+    conn = connect()
+    try:
+        cursor = conn.cursor()
+        
+        # Check if user exists
+        cursor.execute(
+            "SELECT id FROM users WHERE first_name = ? AND last_name = ? AND grade = ?", 
+            (first_name, last_name, grade)
+        )
+        user = cursor.fetchone()
+        
+        if user:
+            # User exists, get their ID
+            user_id = user[0]
+        else:
+            # User doesn't exist, create new user
+            cursor.execute(
+                "INSERT INTO users (first_name, last_name, grade) VALUES (?, ?, ?)",
+                (first_name, last_name, grade)
+            )
+            conn.commit()
+            user_id = cursor.lastrowid
+        
+        # Record this session
+        cursor.execute(
+            "INSERT INTO sessions (user_id, login_time) VALUES (?, ?)",
+            (user_id, datetime.datetime.now())
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    return user_id
+
+def save_survey_results(user_id, answers, points, progress, badges, connect=connect_db):
+    """Save (survey_type, question, answer) rows and the student's final progress"""
+    conn = connect()
+    try:
+        cursor = conn.cursor()
+        cursor.executemany(
+            "INSERT INTO survey_responses (user_id, survey_type, question, answer) VALUES (?, ?, ?, ?)",
+            [(user_id, survey_type, question, answer) for survey_type, question, answer in answers]
+        )
+        cursor.execute(
+            "INSERT INTO user_progress (user_id, points, progress, badges) VALUES (?, ?, ?, ?)",
+            (user_id, points, progress, ','.join(badges))
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+def read_table(table_name, connect=connect_db):
+    """Return the column names and every row of a table or view"""
+    conn = connect()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(f"PRAGMA table_info({table_name})")
+        columns = [col[1] for col in cursor.fetchall()]
+        cursor.execute(f"SELECT * FROM {table_name}")
+        rows = cursor.fetchall()
+    finally:
+        conn.close()
+    return columns, rows
+
+def load_training_examples():
+    """Return (id, user_id, text, emotion) for every saved training example, oldest first"""
+    conn = connect_db()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT id, user_id, text, emotion FROM training_examples ORDER BY id")
+        rows = cursor.fetchall()
+    finally:
+        conn.close()
+    return rows
+
+def insert_training_example(user_id, text, emotion, connect=connect_db):
+    """Save a training example and return its id"""
+    conn = connect()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            "INSERT INTO training_examples (user_id, text, emotion) VALUES (?, ?, ?)",
+            (user_id, text, emotion)
+        )
+        conn.commit()
+        example_id = cursor.lastrowid
+    finally:
+        conn.close()
+    return example_id
+
+def delete_training_example(example_id):
+    """Remove a saved training example"""
+    conn = connect_db()
+    try:
+        conn.execute("DELETE FROM training_examples WHERE id = ?", (example_id,))
+        conn.commit()
+    finally:
+        conn.close()
+
+def read_labelled_file(path, progress=None):
+    """
+    Stream (text, emotion) pairs from a CSV file with text and emotion columns,
+    or a JSONL file with one {"text": ..., "emotion": ...} object per line
+    A row that can't be read gives ("", ""), so it is counted as invalid instead of ending the import
+    progress is called with the fraction of the file read so far
+    """
+    total_bytes = max(os.path.getsize(path), 1)
+    read_bytes = 0
+    
+    def lines(f):
+        nonlocal read_bytes
+        for line in f:
+            read_bytes += len(line.encode("utf-8"))
+            yield line
+    
+    def json_records(f):
+        for line in lines(f):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield None
+    
+    def csv_records(f):
+        reader = csv.DictReader(lines(f))
+        while True:
+            try:
+                yield next(reader)
+            except StopIteration:
+                return
+            except csv.Error:
+                yield None
+    
+    def field(record, *names):
+        for name in names:
+            value = record.get(name)
+            if isinstance(value, str) and value:
+                return value
+        return ""
+    
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        records = json_records(f) if path.lower().endswith((".jsonl", ".json")) else csv_records(f)
+        for record in records:
+            if isinstance(record, dict):
+                yield field(record, "text"), field(record, "emotion", "label")
+            else:
+                yield "", ""
+            if progress:
+                progress(read_bytes / total_bytes)
+
+def import_training_examples(path, valid_emotions, user_id=None, batch_size=1000, progress=None,
+                             connect=connect_db):
+    """
+    Add every valid, new example in a labelled file to training_examples
+    Rows are inserted in batches on one connection; returns counts of what happened to the rows
+    """
+    totals = {"added": 0, "duplicates": 0, "invalid": 0}
+    
+    conn = connect()
+    try:
+        cursor = conn.cursor()
+        create_tables(cursor)
+        conn.commit()
+        
+        # Examples already known, by normalized text and emotion. Other students' examples only
+        # teach their own overlays, so they don't count, like in prepare_training_data
+        seen = {(DuplicateIndex.normalize(text), emotion)
+                for text, emotion in zip(SEED_DATA["texts"], SEED_DATA["emotions"])}
+        cursor.execute("SELECT text, emotion FROM training_examples WHERE user_id IS NULL OR user_id IS ?",
+                       (user_id,))
+        seen.update((DuplicateIndex.normalize(text), emotion) for text, emotion in cursor)
+        
+        batch = []
+        for text, emotion in read_labelled_file(path, progress):
+            emotion = emotion.strip().lower()
+            if not text.strip() or emotion not in valid_emotions:
+                totals["invalid"] += 1
+                continue
+            key = (DuplicateIndex.normalize(text), emotion)
+            if key in seen:
+                totals["duplicates"] += 1
+                continue
+            seen.add(key)
+            batch.append((user_id, text.strip(), emotion))
+            
+            if len(batch) >= batch_size:
+                cursor.executemany("INSERT INTO training_examples (user_id, text, emotion) VALUES (?, ?, ?)", batch)
+                conn.commit()
+                totals["added"] += len(batch)
+                batch = []
+        
+        if batch:
+            cursor.executemany("INSERT INTO training_examples (user_id, text, emotion) VALUES (?, ?, ?)", batch)
+            conn.commit()
+            totals["added"] += len(batch)
+    finally:
+        conn.close()
+    return totals
+
+def write_events(events, connect=connect_db):
+    """Insert interaction event rows in one transaction"""
+    conn = connect()
+    try:
+        conn.executemany(
+            "INSERT INTO interaction_events "
+            "(user_id, event_time, action, text_hash, emotion, confidence, latency_ms, details) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            events
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+class EventLog:
+    """Buffers interaction events in memory and writes them to the database in batches"""
+    def __init__(self, root=None, settings=EVENT_LOG_SETTINGS):
+        self.root = root
+        self.settings = settings
+        self.buffer = []
+        self.after_id = None
+
+    def log(self, user_id, action, text=None, emotion=None, confidence=None, latency_ms=None, details=None):
+        """Record one event; only a short hash of the student's text is kept"""
+        text_hash = hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest() if text else None
+        self.buffer.append((user_id, datetime.datetime.now().isoformat(" "), action,
+                            text_hash, emotion, confidence, latency_ms, details))
+
+        if len(self.buffer) >= self.settings["batch_size"]:
+            self.flush()
+        elif self.root and not self.after_id:
+            self.after_id = self.root.after(self.settings["flush_interval_ms"], self._scheduled_flush)
+
+    def _scheduled_flush(self):
+        self.after_id = None
+        self.flush()
+
+    def flush(self):
+        """Write all buffered events in one transaction"""
+        if not self.buffer:
+            return
+        events, self.buffer = self.buffer, []
+        try:
+            write_events(events)
+        except Exception as e:
+            print(f"Error saving interaction events: {e}")
+
+    def close(self):
+        """Cancel the flush timer and write what is left"""
+        if self.after_id:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+        self.flush()
+
+def merge_databases(source_paths, target_path=None):
+    """
+    Merge other classroom databases into the target database
+    Students are matched on first name, last name and grade, and their
+    sessions, survey answers and progress are copied with the new user ids
+    Saved states are kept from whichever database updated them last
+    Rows the target already has are skipped, so a file can be merged again safely
+    With no target path the app database is used
+    Returns a dictionary with the number of rows added per table
+    """
+    totals = {"students": 0, "sessions": 0, "survey_responses": 0, "user_progress": 0,
+              "interaction_events": 0, "training_examples": 0, "user_state": 0}
+
+    conn = sqlite3.connect(target_path) if target_path else connect_db()
+    try:
+        cursor = conn.cursor()
+        create_tables(cursor)
+        conn.commit()
+
+        for source_path in source_paths:
+            # Never merge a database into itself
+            target_file = target_path or DB_PATH
+            if (os.path.exists(source_path) and os.path.exists(target_file)
+                    and os.path.samefile(source_path, target_file)):
+                continue
+
+            cursor.execute("ATTACH DATABASE ? AS source", (source_path,))
+            try:
+                cursor.execute("SELECT name FROM source.sqlite_master WHERE type = 'table'")
+                source_tables = {row[0] for row in cursor.fetchall()}
+                if "users" not in source_tables:
+                    continue
+
+                # Add students that aren't in the target yet, all in one statement
+                cursor.execute('''
+                INSERT INTO main.users (first_name, last_name, grade, created_at)
+                SELECT s.first_name, s.last_name, s.grade, MIN(s.created_at)
+                FROM source.users s
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM main.users u
+                    WHERE u.first_name = s.first_name AND u.last_name = s.last_name AND u.grade = s.grade
+                )
+                GROUP BY s.first_name, s.last_name, s.grade
+                ''')
+                totals["students"] += cursor.rowcount
+
+                # Map every source user id to the matching target user id
+                cursor.execute('''
+                CREATE TEMP TABLE user_map AS
+                SELECT s.id AS old_id, MIN(u.id) AS new_id
+                FROM source.users s
+                JOIN main.users u
+                  ON u.first_name = s.first_name AND u.last_name = s.last_name AND u.grade = s.grade
+                GROUP BY s.id
+                ''')
+                cursor.execute("CREATE UNIQUE INDEX temp.idx_user_map ON user_map (old_id)")
+
+                # Copy the rows that reference users, remapping their user ids. Events and training
+                # examples without a user (teacher imports and the shared corpus) are copied as they are.
+                # Rows the target already has are skipped, so merging the same file again adds nothing
+                copies = {
+                    "sessions": ("login_time",),
+                    "survey_responses": ("survey_type", "question", "answer", "submitted_at"),
+                    "user_progress": ("points", "progress", "badges", "completed_at"),
+                    "interaction_events": ("event_time", "action", "text_hash", "emotion", "confidence",
+                                           "latency_ms", "details"),
+                    "training_examples": ("text", "emotion", "added_at")
+                }
+                # Columns that tell whether the target already has a row, besides the user id
+                keys = {"training_examples": ("text", "emotion")}
+                for table, columns in copies.items():
+                    if table not in source_tables:
+                        continue
+                    column_list = ", ".join(columns)
+                    source_columns = ", ".join(f"t.{column}" for column in columns)
+                    if table in ("interaction_events", "training_examples"):
+                        join = ("LEFT JOIN temp.user_map m ON m.old_id = t.user_id "
+                                "WHERE (t.user_id IS NULL OR m.new_id IS NOT NULL)")
+                    else:
+                        join = "JOIN temp.user_map m ON m.old_id = t.user_id WHERE 1"
+                    # IS compares NULLs as equal, so rows without a user are matched too
+                    matches = " AND ".join(f"x.{column} IS t.{column}" for column in keys.get(table, columns))
+                    cursor.execute(f'''
+                    INSERT INTO main.{table} (user_id, {column_list})
+                    SELECT m.new_id, {source_columns}
+                    FROM source.{table} t
+                    {join}
+                    AND NOT EXISTS (
+                        SELECT 1 FROM main.{table} x
+                        WHERE x.user_id IS m.new_id AND {matches}
+                    )
+                    ''')
+                    totals[table] += cursor.rowcount
+
+                # Each student has one saved state, so keep whichever database saved it last
+                if "user_state" in source_tables:
+                    cursor.execute('''
+                    INSERT INTO main.user_state (user_id, points, progress, badges, challenges, updated_at)
+                    SELECT m.new_id, t.points, t.progress, t.badges, t.challenges, t.updated_at
+                    FROM source.user_state t
+                    JOIN temp.user_map m ON m.old_id = t.user_id
+                    WHERE true
+                    ON CONFLICT (user_id) DO UPDATE SET
+                        points = excluded.points, progress = excluded.progress, badges = excluded.badges,
+                        challenges = excluded.challenges, updated_at = excluded.updated_at
+                    WHERE user_state.updated_at IS NULL OR excluded.updated_at > user_state.updated_at
+                    ''')
+                    totals["user_state"] += cursor.rowcount
+
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                cursor.execute("DROP TABLE IF EXISTS temp.user_map")
+                cursor.execute("DETACH DATABASE source")
+    finally:
+        conn.close()
+    return totals
+
+class ScrollRouter:
+    """Sends mouse wheel events to the scrollable canvas under the pointer"""
+    def __init__(self):
+        self.canvases = set()
+        self.installed = False
+    
+    def register(self, canvas):
+        """Let the mouse wheel scroll this canvas when the pointer is over it"""
+        # The global bindings are made once and shared by every canvas
+        if not self.installed:
+            canvas.bind_all("<MouseWheel>", self._on_mousewheel)  # For Windows
+            canvas.bind_all("<Button-4>", lambda e: self._scroll(e, -1))  # For Linux
+            canvas.bind_all("<Button-5>", lambda e: self._scroll(e, 1))  # For Linux
+            self.installed = True
+        
+        self.canvases.add(canvas)
+        canvas.bind("<Destroy>", lambda e: self.canvases.discard(canvas), add="+")
+    
+    def _canvas_under_pointer(self, event):
+        try:
+            widget = event.widget.winfo_containing(event.x_root, event.y_root)
+        except (AttributeError, KeyError, tk.TclError):
+            return None
+        while widget is not None:
+            if widget in self.canvases:
+                return widget
+            widget = widget.master
+        return None
+    
+    def _on_mousewheel(self, event):
+        self._scroll(event, int(-1*(event.delta/120)))
+    
+    def _scroll(self, event, units):
+        canvas = self._canvas_under_pointer(event)
+        if canvas is not None and units:
+            canvas.yview_scroll(units, "units")
+
+# The router shared by every scrollable frame
+SCROLL_ROUTER = ScrollRouter()
+
 # Utility function to create scrollable frames
 def create_scrollable_frame(parent_frame):
     """
@@ -48,15 +995,26 @@ def create_scrollable_frame(parent_frame):
     interior_frame = tk.Frame(canvas, bg=COLORS["background"])
     interior_id = canvas.create_window(0, 0, window=interior_frame, anchor="nw", tags="interior")
     
-    # Configure the canvas to resize the interior frame when configured
-    def _configure_interior(event):
+    # Configure events arrive in bursts while a page is built or changes,
+    # so the scrollregion is updated once when Tk is idle
+    pending = {"update": None, "size": None}
+    
+    def _update_scrollregion():
+        pending["update"] = None
         # Update the scrollregion to encompass the interior frame
         size = (interior_frame.winfo_reqwidth(), interior_frame.winfo_reqheight())
-        canvas.config(scrollregion="0 0 %s %s" % size)
+        if size != pending["size"]:
+            pending["size"] = size
+            canvas.config(scrollregion="0 0 %s %s" % size)
         # Resize the canvas's width to fit the interior frame
         if interior_frame.winfo_reqwidth() != canvas.winfo_width():
             canvas.config(width=interior_frame.winfo_reqwidth())
     
+    # Configure the canvas to resize the interior frame when configured
+    def _configure_interior(event):
+        if pending["update"] is None:
+            pending["update"] = canvas.after_idle(_update_scrollregion)
+    
     interior_frame.bind('<Configure>', _configure_interior)
     
     def _configure_canvas(event):
@@ -66,18 +1024,13 @@ def create_scrollable_frame(parent_frame):
     
     canvas.bind('<Configure>', _configure_canvas)
     
-    # Bind mouse wheel events for scrolling
-    def _on_mousewheel(event):
-        canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-    
-    canvas.bind_all("<MouseWheel>", _on_mousewheel)  # For Windows
-    canvas.bind_all("<Button-4>", lambda e: canvas.yview_scroll(-1, "units"))  # For Linux
-    canvas.bind_all("<Button-5>", lambda e: canvas.yview_scroll(1, "units"))  # For Linux
+    # Scroll this canvas with the mouse wheel while the pointer is over it
+    SCROLL_ROUTER.register(canvas)
     
     return canvas, interior_frame
 
 class BouncingButton(tk.Button):
-    """A button that bounces when hovered over"""
+    """A button that lights up when hovered over"""
     def __init__(self, master, **kwargs):
         super().__init__(master, **kwargs)
         self.bind("<Enter>", self._on_enter)
@@ -92,47 +1045,598 @@ class BouncingButton(tk.Button):
         self.hover_fg = COLORS["light_text"]
         
         # Add round corners and shadow effect with styling
-        self.config(relief="raised", borderwidth=0, padx=15, pady=8)
+        self.config(relief="raised", borderwidth=0, padx=15, pady=8, cursor="hand2")
         
+    # Hovering only changes colors: a font or size change would make Tk
+    # measure the button again and reflow the whole scrollable page
     def _on_enter(self, event):
-        # Change colors
         self.config(background=self.hover_bg, foreground=self.hover_fg)
         
-        # Make button slightly larger for bounce effect
-        current_font = self.cget("font")
-        if isinstance(current_font, str):
-            # Handle default font string
-            self.config(font=(current_font, 12, "bold"))
-        else:
-            # Handle tuple font
-            larger_font = (current_font[0], current_font[1] + 2, current_font[2])
-            self.config(font=larger_font)
-        
     def _on_leave(self, event):
         # Restore original appearance
         self.config(background=self.original_bg, foreground=self.original_fg)
-        
-        # Restore original font size
-        current_font = self.cget("font")
-        if isinstance(current_font, str):
-            # Handle default font string
-            self.config(font=(current_font, 10, "bold"))
-        else:
-            # Handle tuple font
-            original_font = (current_font[0], current_font[1] - 2, current_font[2])
-            self.config(font=original_font)
 
-class RainbowText(tk.Frame):
-    """Create text with rainbow colored letters"""
-    def __init__(self, master, text, font=FONTS["title"], **kwargs):
-        super().__init__(master, bg=COLORS["background"], **kwargs)
+class RainbowText(tk.Text):
+    """Create text with rainbow colored letters in a single widget"""
+    def __init__(self, master, text, font="title", **kwargs):
+        font = get_font(font)
+        super().__init__(master, font=font, bg=COLORS["background"], bd=0, highlightthickness=0,
+                         wrap="word", height=1, cursor="arrow", takefocus=0, insertwidth=0,
+                         selectbackground=COLORS["background"], exportselection=False, **kwargs)
         
         rainbow_colors = ["#FF9AA2", "#FFB7B2", "#FFDAC1", "#E2F0CB", "#B5EAD7", "#C7CEEA"]
         
+        # One color tag per rainbow color, and all letters inserted in one call
+        for color in rainbow_colors:
+            self.tag_configure(color, foreground=color)
+        tagged_chars = []
         for i, char in enumerate(text):
-            color = rainbow_colors[i % len(rainbow_colors)]
-            label = tk.Label(self, text=char, font=font, bg=COLORS["background"], fg=color)
-            label.pack(side="left", padx=0)
+            tagged_chars += [char, rainbow_colors[i % len(rainbow_colors)]]
+        if tagged_chars:
+            self.insert("end", *tagged_chars)
+        self.config(state="disabled")
+        
+        # Ask for enough width to keep the text on one line, like the old row of labels
+        self.config(width=max(1, math.ceil(font.measure(text) / max(font.measure("0"), 1))))
+        
+        # Grow to more lines if the window is too narrow for the text
+        self.bind("<Configure>", self._fit_height)
+    
+    def _fit_height(self, event):
+        # Count the display line breaks inside the text
+        breaks = self.count("1.0", "end-1c", "displaylines")
+        if isinstance(breaks, tuple):
+            breaks = breaks[0]
+        lines = (breaks or 0) + 1
+        if int(self.cget("height")) != lines:
+            self.config(height=lines)
+
+class NumpyHashingVectorizer:
+    """Word hashing like scikit-learn's HashingVectorizer, built on NumPy and SciPy only"""
+    TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+    
+    def __init__(self, n_features, bigrams=False, dtype=np.float32):
+        self.n_features = n_features
+        self.bigrams = bigrams
+        self.dtype = dtype
+    
+    def analyze(self, text):
+        words = self.TOKEN_PATTERN.findall(text.lower())
+        if self.bigrams:
+            words += [" ".join(pair) for pair in zip(words, words[1:])]
+        return words
+    
+    def build_analyzer(self):
+        return self.analyze
+    
+    def column(self, token):
+        return zlib.crc32(token.encode("utf-8")) % self.n_features
+    
+    def transform(self, texts):
+        """Rows of token counts, each scaled to unit length"""
+        rows, columns = [], []
+        for i, text in enumerate(texts):
+            for token in self.analyze(text):
+                rows.append(i)
+                columns.append(self.column(token))
+        X = sparse.csr_matrix((np.ones(len(rows), dtype=self.dtype), (rows, columns)),
+                              shape=(len(texts), self.n_features))
+        X.sum_duplicates()
+        norms = np.sqrt(np.asarray(X.multiply(X).sum(axis=1)).ravel())
+        X.data /= np.repeat(np.where(norms > 0, norms, 1), np.diff(X.indptr)).astype(self.dtype)
+        return X
+
+class FeaturePipeline:
+    """Turns texts into feature rows as configured in FEATURE_SETTINGS"""
+    def __init__(self, settings=FEATURE_SETTINGS):
+        self.settings = settings
+        ngram_range = (1, 2) if settings["bigrams"] else (1, 1)
+        dtype = np.dtype(settings["dtype"])
+        # scikit-learn is only imported when a mode needs it
+        if settings["mode"] == "numpy":
+            self.vectorizer = NumpyHashingVectorizer(settings["n_features"], settings["bigrams"], dtype)
+            self.column = self.vectorizer.column
+        elif settings["mode"] == "hashing":
+            from sklearn.feature_extraction.text import HashingVectorizer
+            from sklearn.utils import murmurhash3_32
+            self.vectorizer = HashingVectorizer(n_features=settings["n_features"], ngram_range=ngram_range,
+                                                alternate_sign=False, dtype=dtype)
+            self.column = lambda token: abs(murmurhash3_32(token, seed=0)) % settings["n_features"]
+        else:
+            from sklearn.feature_extraction.text import TfidfVectorizer
+            self.vectorizer = TfidfVectorizer(min_df=settings["min_df"], max_features=settings["max_features"],
+                                              ngram_range=ngram_range, dtype=dtype)
+        self.analyzer = self.vectorizer.build_analyzer()
+        self.vocabulary_names = None
+    
+    @property
+    def fixed(self):
+        """True when the feature columns never change, so rows can be added without a refit"""
+        return self.settings["mode"] in ("hashing", "numpy")
+    
+    def fit_transform(self, texts):
+        if self.fixed:
+            return self.vectorizer.transform(texts)
+        X = self.vectorizer.fit_transform(texts)
+        self.vocabulary_names = self.vectorizer.get_feature_names_out()
+        return X
+    
+    def transform(self, texts):
+        return self.vectorizer.transform(texts)
+    
+    def feature_names(self, text, columns):
+        """Word or word pair for each column of a transformed text"""
+        if not self.fixed:
+            return self.vocabulary_names[columns]
+        # Hashed columns have no stored names, so hash the text's own tokens again
+        names = {self.column(token): token for token in self.analyzer(text)}
+        return np.array([names.get(column, "?") for column in columns])
+    
+    def find_names(self, columns, texts):
+        """Name hashed columns by hashing the tokens of texts, stopping once all are found"""
+        missing = set(columns)
+        names = {}
+        for text in texts:
+            if not missing:
+                break
+            for token in self.analyzer(text):
+                column = self.column(token)
+                if column in missing:
+                    names[column] = token
+                    missing.discard(column)
+        return names
+
+class SklearnNaiveBayes:
+    """scikit-learn's MultinomialNB behind the classifier backend interface"""
+    def __init__(self, settings=MODEL_SETTINGS):
+        from sklearn.naive_bayes import MultinomialNB
+        self.model = MultinomialNB(alpha=settings["alpha"])
+    
+    @property
+    def classes_(self):
+        return self.model.classes_
+    
+    @property
+    def feature_log_prob_(self):
+        return self.model.feature_log_prob_
+    
+    @property
+    def feature_count_(self):
+        return self.model.feature_count_
+    
+    @property
+    def class_count_(self):
+        return self.model.class_count_
+    
+    @property
+    def alpha(self):
+        return self.model.alpha
+    
+    def fit(self, X, y):
+        self.model.fit(X, y)
+        return self
+    
+    def partial_fit(self, X, y, sample_weight=None):
+        """Add rows to a fitted model; a weight of -1 takes a row back out"""
+        self.model.partial_fit(X, y, sample_weight=sample_weight)
+        return self
+    
+    def predict_proba(self, X, overlay=None):
+        if overlay is not None and not overlay.empty:
+            return overlay_predict_proba(self, X, overlay)
+        return self.model.predict_proba(X)
+    
+    def token_contributions(self, text_vec, class_index, overlay=None):
+        return token_contributions(self, text_vec, class_index, overlay)
+
+class NumpyNaiveBayes:
+    """
+    Multinomial Naive Bayes without scikit-learn, with the same results as scikit-learn's
+    Needs NumPy and SciPy, whose sparse matrices hold the feature rows it counts
+    Keeps the per-emotion word counts, so adding or removing rows is a sparse update
+    """
+    def __init__(self, settings=MODEL_SETTINGS):
+        self.alpha = settings["alpha"]
+        self.classes_ = np.array([])
+    
+    def fit(self, X, y):
+        self.classes_ = np.unique(y)
+        self.class_count_ = np.zeros(len(self.classes_))
+        self.feature_count_ = np.zeros((len(self.classes_), X.shape[1]))
+        return self.partial_fit(X, y)
+    
+    def partial_fit(self, X, y, sample_weight=None):
+        """Add rows to a fitted model; a weight of -1 takes a row back out"""
+        y = np.asarray(y)
+        if not np.isin(y, self.classes_).all():
+            raise ValueError(f"Unknown emotions {set(y) - set(self.classes_)}, fit the model again")
+        weights = np.ones(len(y)) if sample_weight is None else np.asarray(sample_weight, dtype=float)
+        
+        # One row per emotion with the weight of each example that has it
+        Y = np.zeros((len(y), len(self.classes_)))
+        Y[np.arange(len(y)), np.searchsorted(self.classes_, y)] = weights
+        self.class_count_ += Y.sum(axis=0)
+        self.feature_count_ += np.asarray(sparse.csr_matrix(X).T @ Y).T
+        
+        smoothed = self.feature_count_ + self.alpha
+        self.feature_log_prob_ = np.log(smoothed) - np.log(smoothed.sum(axis=1, keepdims=True))
+        self.class_log_prior_ = np.log(self.class_count_) - np.log(self.class_count_.sum())
+        return self
+    
+    def predict_proba(self, X, overlay=None):
+        if overlay is not None and not overlay.empty:
+            return overlay_predict_proba(self, X, overlay)
+        return softmax(np.asarray(X @ self.feature_log_prob_.T) + self.class_log_prior_)
+    
+    def token_contributions(self, text_vec, class_index, overlay=None):
+        return token_contributions(self, text_vec, class_index, overlay)
+
+class TopWordsIndex:
+    """
+    The words that point most strongly to each emotion, by how much likelier they are for it
+    than for the other emotions on average (a log-probability ratio)
+    Only the per-emotion counts of a word decide its rank, so a training change only rescores
+    the words it touched. Each emotion keeps its best candidates and the lowest of their scores;
+    every other word scores at most that floor, so the candidates always hold the true top words
+    """
+    def __init__(self, settings=TOP_WORDS_SETTINGS):
+        self.settings = settings
+        self.alpha = 1.0
+        self.candidates = []  # Per emotion: column -> score
+        self.floors = []
+    
+    def scores(self, counts):
+        log_counts = np.log(counts + self.alpha)
+        if len(log_counts) < 2:
+            return log_counts
+        others = (log_counts.sum(axis=0) - log_counts) / (len(log_counts) - 1)
+        return log_counts - others
+    
+    def rebuild(self, counts, alpha):
+        """Rank every column from the full per-emotion count matrix"""
+        self.alpha = alpha
+        scores = self.scores(counts)
+        size = min(self.settings["candidates"], scores.shape[1])
+        self.candidates = []
+        self.floors = []
+        for row in scores:
+            top = np.argpartition(-row, size - 1)[:size]
+            self.candidates.append(dict(zip(top.tolist(), row[top].tolist())))
+            self.floors.append(row[top].min())
+    
+    def update(self, columns, counts):
+        """
+        Rescore the columns whose counts changed, given their new per-emotion counts
+        Returns False when an emotion has too few candidates left and needs a rebuild
+        """
+        scores = self.scores(counts)
+        complete = True
+        for candidates, floor, row in zip(self.candidates, self.floors, scores):
+            for column, score in zip(columns, row):
+                if score >= floor:
+                    candidates[column] = score
+                else:
+                    candidates.pop(column, None)
+            complete = complete and len(candidates) >= self.settings["top_k"]
+        return complete
+    
+    def top(self, class_index):
+        """Columns of the best words for one emotion, best first"""
+        candidates = self.candidates[class_index]
+        return sorted(candidates, key=candidates.get, reverse=True)[:self.settings["top_k"]]
+
+class StudentOverlay:
+    """
+    One student's own examples, kept as sparse changes to the shared model's word and emotion counts
+    Memory grows with the words the student taught, not with the vocabulary
+    """
+    def __init__(self, classes, n_features):
+        self.classes = classes
+        self.feature_count = sparse.csr_matrix((len(classes), n_features))
+        self.class_count = np.zeros(len(classes))
+    
+    @property
+    def empty(self):
+        return not self.class_count.any()
+    
+    def add(self, rows, emotions, weight=1.0):
+        """Count feature rows for their emotions; a weight of -1 takes them back out"""
+        Y = sparse.csr_matrix((np.full(len(emotions), weight),
+                               (np.searchsorted(self.classes, emotions), np.arange(len(emotions)))),
+                              shape=(len(self.classes), len(emotions)))
+        self.feature_count = (self.feature_count + Y @ rows).tocsr()
+        self.feature_count.eliminate_zeros()
+        self.class_count += np.asarray(Y.sum(axis=1)).ravel()
+
+def softmax(scores):
+    scores = scores - scores.max(axis=1, keepdims=True)
+    probabilities = np.exp(scores)
+    return probabilities / probabilities.sum(axis=1, keepdims=True)
+
+def combined_log_probs(model, columns, overlay):
+    """
+    Word log probabilities for some columns and the emotion log priors, with a student's counts
+    added to the shared model's; the same numbers a model refit on both sets of examples would give
+    """
+    alpha = model.alpha
+    counts = model.feature_count_[:, columns] + overlay.feature_count[:, columns].toarray()
+    totals = model.feature_count_.sum(axis=1) + np.asarray(overlay.feature_count.sum(axis=1)).ravel()
+    log_probs = np.log(counts + alpha) - np.log(totals + alpha * model.feature_count_.shape[1])[:, None]
+    class_count = model.class_count_ + overlay.class_count
+    return log_probs, np.log(class_count) - np.log(class_count.sum())
+
+def overlay_predict_proba(model, X, overlay):
+    """Emotion probabilities from the shared model and a student's overlay, without refitting either"""
+    X = sparse.csr_matrix(X)
+    columns = np.unique(X.indices)
+    log_probs, class_log_prior = combined_log_probs(model, columns, overlay)
+    return softmax(np.asarray(X[:, columns] @ log_probs.T) + class_log_prior)
+
+def token_contributions(model, text_vec, class_index, overlay=None):
+    """
+    How much each column of a one-row text pushes the guess toward one emotion
+    Its weight times how much likelier the word is for that emotion than on average
+    """
+    if overlay is not None and not overlay.empty:
+        log_probs = combined_log_probs(model, text_vec.indices, overlay)[0]
+    else:
+        log_probs = model.feature_log_prob_[:, text_vec.indices]
+    return text_vec.data * (log_probs[class_index] - log_probs.mean(axis=0))
+
+# Classifier backends by name, chosen with MODEL_SETTINGS["backend"]
+CLASSIFIER_BACKENDS = {
+    "sklearn": SklearnNaiveBayes,
+    "numpy": NumpyNaiveBayes
+}
+
+class SimilarityIndex:
+    """
+    Finds the training examples most like a text by cosine similarity
+    Rows are kept in column-major (CSC) blocks, so each feature column is a
+    posting list and a query only reads the columns of the words it contains
+    """
+    def __init__(self, X=None, settings=SIMILAR_EXAMPLES_SETTINGS):
+        self.settings = settings
+        self.blocks = []
+        self.norms = []
+        self.n_rows = 0
+        if X is not None:
+            self.rebuild(X)
+    
+    def rebuild(self, X):
+        """Index a whole feature matrix, e.g. after the vocabulary changed"""
+        self.blocks = []
+        self.norms = []
+        self.n_rows = 0
+        self.add(X)
+    
+    def add(self, rows):
+        """Index new rows that use the same feature columns as the rows already indexed"""
+        if rows.shape[0] == 0:
+            return
+        block = sparse.csc_matrix(rows)
+        self.blocks.append(block)
+        self.norms.append(np.sqrt(np.asarray(block.multiply(block).sum(axis=1)).ravel()))
+        self.n_rows += rows.shape[0]
+        
+        # Keep the number of blocks small so queries stay a few vectorized calls
+        if len(self.blocks) > self.settings["max_blocks"]:
+            self.blocks = [sparse.vstack(self.blocks, format="csc")]
+            self.norms = [np.concatenate(self.norms)]
+    
+    def query(self, query_vec, k, allowed=None):
+        """Return up to k (row, similarity) pairs, most similar first; allowed is an optional row mask"""
+        if not self.n_rows or query_vec.nnz == 0:
+            return []
+        query_vec = sparse.csr_matrix(query_vec)
+        columns = query_vec.indices
+        values = query_vec.data / np.sqrt(np.dot(query_vec.data, query_vec.data))
+        
+        # Sparse dot products against only the posting lists of the query's words
+        scores = []
+        for block, norms in zip(self.blocks, self.norms):
+            dots = np.asarray(block[:, columns] @ values).ravel()
+            scores.append(np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0))
+        scores = np.concatenate(scores)
+        if allowed is not None:
+            scores[~allowed] = 0
+        
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(row), float(scores[row])) for row in top if scores[row] > 0]
+
+class DuplicateIndex:
+    """
+    Finds training examples that are (almost) the same as a new one
+    Each text gets a MinHash signature of its character shingles; signatures are
+    split into LSH bands so only examples sharing a band are compared
+    Examples are keyed by normalized text and emotion, so removing rows elsewhere never shifts them
+    Signatures and band hashes are kept in NumPy arrays, so indexing a whole corpus is a few
+    vectorized passes and a lookup compares one band row against all of them at once
+    """
+    def __init__(self, settings=DUPLICATE_SETTINGS):
+        self.settings = settings
+        rng = np.random.default_rng(settings["seed"])
+        # Multiply-shift hashes: odd multipliers, the top 32 bits of the 64-bit result
+        self.a = rng.integers(0, 2**63, settings["num_hashes"], dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self.b = rng.integers(0, 2**63, settings["num_hashes"], dtype=np.uint64)
+        self.rows = settings["num_hashes"] // settings["bands"]
+        self.keys = []        # Row -> key; rows of removed keys stay behind, marked dead
+        self.row_of = {}      # key -> row
+        self.counts = {}      # key -> number of stored examples with that key
+        self.signatures = np.zeros((0, settings["num_hashes"]), dtype=np.uint32)
+        self.band_hashes = np.zeros((0, settings["bands"]), dtype=np.uint64)
+        self.alive = np.zeros(0, dtype=bool)
+    
+    @staticmethod
+    def normalize(text):
+        return " ".join(re.sub(r"[^\w\s]", " ", text.lower()).split())
+    
+    def minhash(self, normalized_texts):
+        """
+        MinHash signatures of many normalized texts, one row each
+        Shingles are hashed from the texts' code points, so no Python code runs per shingle;
+        texts shorter than a shingle are padded and count as one shingle
+        """
+        size = self.settings["shingle_size"]
+        padded = [text.ljust(size, "\0") for text in normalized_texts]
+        lengths = np.array([len(text) for text in padded])
+        codes = np.frombuffer("".join(padded).encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+        
+        # Start of every shingle that lies inside one text, and where each text's shingles begin
+        counts = lengths - size + 1
+        text_starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        first_shingle = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        starts = np.arange(counts.sum()) + np.repeat(text_starts - first_shingle, counts)
+        hashes = np.zeros(len(starts), dtype=np.uint64)
+        for offset in range(size):
+            hashes = hashes * np.uint64(1000003) + codes[starts + offset]
+        
+        # One hash per signature slot, minimum over each text's shingles
+        signatures = np.empty((len(padded), self.settings["num_hashes"]), dtype=np.uint32)
+        for slot, (a, b) in enumerate(zip(self.a, self.b)):
+            signatures[:, slot] = np.minimum.reduceat((hashes * a + b) >> np.uint64(32), first_shingle)
+        return signatures
+    
+    def bands(self, signatures):
+        """One 64-bit hash per LSH band of each signature"""
+        rows = signatures.reshape(len(signatures), self.settings["bands"], self.rows).astype(np.uint64)
+        hashes = np.zeros(rows.shape[:2], dtype=np.uint64)
+        for row in range(self.rows):
+            hashes = hashes * np.uint64(0x100000001B3) + rows[:, :, row]
+        return hashes
+    
+    def add(self, text, emotion):
+        self.add_many([text], [emotion])
+    
+    def add_many(self, texts, emotions):
+        """Index many examples at once; signatures are only computed for texts not indexed yet"""
+        keys = [(self.normalize(text), emotion) for text, emotion in zip(texts, emotions)]
+        new_keys = list(dict.fromkeys(key for key in keys if key not in self.counts))
+        if new_keys:
+            signatures = self.minhash([key[0] for key in new_keys])
+            self.row_of.update(zip(new_keys, range(len(self.keys), len(self.keys) + len(new_keys))))
+            self.keys.extend(new_keys)
+            self.signatures = np.concatenate([self.signatures, signatures])
+            self.band_hashes = np.concatenate([self.band_hashes, self.bands(signatures)])
+            self.alive = np.concatenate([self.alive, np.ones(len(new_keys), dtype=bool)])
+            self.counts.update((key, 0) for key in new_keys)
+        for key in keys:
+            self.counts[key] += 1
+    
+    def remove(self, text, emotion):
+        key = (self.normalize(text), emotion)
+        if key not in self.counts:
+            return
+        self.counts[key] -= 1
+        if self.counts[key] == 0:
+            self.alive[self.row_of.pop(key)] = False
+            del self.counts[key]
+    
+    def find(self, text, emotion):
+        """Return the normalized text of a stored near-duplicate with the same emotion, or None"""
+        normalized = self.normalize(text)
+        if (normalized, emotion) in self.counts:
+            return normalized
+        signature = self.minhash([normalized])
+        candidates = np.flatnonzero((self.band_hashes == self.bands(signature)).any(axis=1) & self.alive)
+        for row in candidates:
+            if (self.keys[row][1] == emotion
+                    and np.mean(self.signatures[row] == signature[0]) >= self.settings["threshold"]):
+                return self.keys[row][0]
+        return None
+
+class NotificationQueue:
+    """In-window banners that combine the messages from one click and hide by themselves"""
+    def __init__(self, root, settings=NOTIFICATION_SETTINGS):
+        self.root = root
+        self.settings = settings
+        self.pending = []                   # Messages from the click being handled
+        self.waiting = collections.deque()  # Banners waiting for the current one to expire
+        self.flush_id = None
+        self.hide_id = None
+        
+        # The banner floats over the page, so showing it never changes the page layout
+        self.banner = tk.Label(root, font=get_font("normal"), bg=COLORS["accent"], fg=COLORS["text"],
+                               bd=2, relief="raised", padx=15, pady=8, justify="center", wraplength=500)
+        self.banner.bind("<Button-1>", lambda e: self._expire())  # Click to dismiss
+    
+    def notify(self, message):
+        """Queue a message; everything queued before Tk is idle shares one banner"""
+        self.pending.append(message)
+        if not self.flush_id:
+            self.flush_id = self.root.after_idle(self._flush_pending)
+    
+    def _flush_pending(self):
+        self.flush_id = None
+        # The same message twice in one click is shown once
+        self.waiting.append(list(dict.fromkeys(self.pending)))
+        self.pending = []
+        if not self.hide_id:
+            self._show_next()
+    
+    def _show_next(self):
+        if not self.waiting:
+            self.banner.place_forget()
+            return
+        
+        # Banners that piled up during rapid clicking are shown together
+        lines = []
+        while self.waiting:
+            lines += self.waiting.popleft()
+        lines = lines[-self.settings["max_lines"]:]
+        
+        self.banner.config(text="\n".join(lines))
+        self.banner.place(relx=0.5, y=10, anchor="n")
+        self.banner.lift()
+        self.hide_id = self.root.after(self.settings["display_ms"], self._expire)
+    
+    def _expire(self):
+        if self.hide_id:
+            self.root.after_cancel(self.hide_id)
+            self.hide_id = None
+        self._show_next()
+
+class ChallengePanel(tk.LabelFrame):
+    """Mission panel that keeps one label per challenge and updates them in place"""
+    def __init__(self, master, challenges, **kwargs):
+        super().__init__(master, text="Your Missions 🚀", font=get_font("subtitle"), bg="#FFD166", bd=2, **kwargs)
+        
+        # Add challenge title
+        title_label = tk.Label(self, text="Challenges:", font=get_font("subtitle"), bg="#FFD166")
+        title_label.pack(pady=5)
+        
+        # Add one label per challenge, sized for its longest text so updates never resize the panel
+        self.labels = {}
+        for key, challenge in challenges.items():
+            c_frame = tk.Frame(self, bg="#FFD166")
+            c_frame.pack(fill="x", pady=5)
+            
+            longest = self.challenge_text(key, dict(challenge, progress=challenge["goal"]))
+            c_label = tk.Label(c_frame, text="", width=len(longest) + 1,
+                               font=get_font("normal"), bg="#FFD166")
+            c_label.pack(pady=2)
+            self.labels[key] = c_label
+        
+        self.refresh(challenges)
+    
+    @staticmethod
+    def challenge_text(key, challenge):
+        # Add emoji based on progress
+        emoji = "🔴"  # Not started
+        if challenge["completed"]:
+            emoji = "✅"  # Completed
+        elif challenge["progress"] > 0:
+            emoji = "🟡"  # In progress
+        return f"{emoji} {key.replace('_', ' ').title()}: {challenge['progress']}/{challenge['goal']}"
+    
+    def refresh(self, challenges):
+        """Change the text of labels whose challenge has changed"""
+        for key, label in self.labels.items():
+            text = self.challenge_text(key, challenges[key])
+            if label.cget("text") != text:
+                label.config(text=text)
 
 class AuthenticationSystem:
     def __init__(self, root, on_successful_login=None):
@@ -161,12 +1665,12 @@ class AuthenticationSystem:
         robot_frame = tk.Frame(self.login_content, bg=COLORS["background"])
         robot_frame.pack(pady=10)
         
-        robot_label = tk.Label(robot_frame, text="🤖", font=("Arial", 72), bg=COLORS["background"])
+        robot_label = tk.Label(robot_frame, text="🤖", font=get_font(("Arial", 72)), bg=COLORS["background"])
         robot_label.pack()
         
         # Add login subtitle
         subtitle = tk.Label(self.login_content, text="Please sign in to start your adventure!", 
-                          font=FONTS["subtitle"], bg=COLORS["background"], fg=COLORS["text"])
+                          font=get_font("subtitle"), bg=COLORS["background"], fg=COLORS["text"])
         subtitle.pack(pady=10)
         
         # Create form frame with pretty styling
@@ -183,39 +1687,39 @@ class AuthenticationSystem:
         first_name_frame = tk.Frame(form_frame, bg="white")
         first_name_frame.pack(fill="x", pady=10, padx=20)
         
-        first_name_emoji = tk.Label(first_name_frame, text="👤", font=("Arial", 16), bg="white")
+        first_name_emoji = tk.Label(first_name_frame, text="👤", font=get_font(("Arial", 16)), bg="white")
         first_name_emoji.pack(side="left", padx=5)
         
         first_name_label = tk.Label(first_name_frame, text="First Name:", 
-                                  font=FONTS["normal"], bg="white")
+                                  font=get_font("normal"), bg="white")
         first_name_label.pack(side="left", pady=5)
         
-        self.first_name_entry = tk.Entry(first_name_frame, font=FONTS["normal"], width=20)
+        self.first_name_entry = tk.Entry(first_name_frame, font=get_font("normal"), width=20)
         self.first_name_entry.pack(side="left", padx=10)
         
         # Last Name
         last_name_frame = tk.Frame(form_frame, bg="white")
         last_name_frame.pack(fill="x", pady=10, padx=20)
         
-        last_name_emoji = tk.Label(last_name_frame, text="👥", font=("Arial", 16), bg="white")
+        last_name_emoji = tk.Label(last_name_frame, text="👥", font=get_font(("Arial", 16)), bg="white")
         last_name_emoji.pack(side="left", padx=5)
         
         last_name_label = tk.Label(last_name_frame, text="Last Name:", 
-                                 font=FONTS["normal"], bg="white")
+                                 font=get_font("normal"), bg="white")
         last_name_label.pack(side="left", pady=5)
         
-        self.last_name_entry = tk.Entry(last_name_frame, font=FONTS["normal"], width=20)
+        self.last_name_entry = tk.Entry(last_name_frame, font=get_font("normal"), width=20)
         self.last_name_entry.pack(side="left", padx=10)
         
         # Grade with fun icons
         grade_frame = tk.Frame(form_frame, bg="white")
         grade_frame.pack(fill="x", pady=10, padx=20)
         
-        grade_emoji = tk.Label(grade_frame, text="🎓", font=("Arial", 16), bg="white")
+        grade_emoji = tk.Label(grade_frame, text="🎓", font=get_font(("Arial", 16)), bg="white")
         grade_emoji.pack(side="left", padx=5)
         
         grade_label = tk.Label(grade_frame, text="My Grade:", 
-                             font=FONTS["normal"], bg="white")
+                             font=get_font("normal"), bg="white")
         grade_label.pack(side="left", pady=5)
         
         grades = ["K 🌱", "1 🐣", "2 🐶", "3 🦊", "4 🦁", "5 🦄", "6 🚀", "7 ⚡", 
@@ -224,12 +1728,12 @@ class AuthenticationSystem:
         
         # Create combobox with colorful options
         self.grade_combo = ttk.Combobox(grade_frame, textvariable=self.grade_var, 
-                                      values=grades, font=FONTS["normal"], width=15)
+                                      values=grades, font=get_font("normal"), width=15)
         self.grade_combo.pack(side="left", padx=10)
         
         # Login button with bounce effect
         login_button = BouncingButton(self.login_content, text="Start Adventure! 🚀", 
-                                    font=FONTS["subtitle"], 
+                                    font=get_font("subtitle"), 
                                     bg=COLORS["secondary"], fg="white",
                                     command=self.login)
         login_button.pack(pady=20)
@@ -241,52 +1745,37 @@ class AuthenticationSystem:
         # Get current user count
         user_count = self.get_user_count()
         
-        stats_label = tk.Label(stats_frame, 
+        self.stats_label = tk.Label(stats_frame, 
                              text=f"{user_count} explorers have joined this adventure!", 
-                             font=FONTS["small"], bg=COLORS["background"], fg=COLORS["text"])
-        stats_label.pack()
+                             font=get_font("small"), bg=COLORS["background"], fg=COLORS["text"])
+        self.stats_label.pack()
     
     def setup_database(self):
         """Create database and tables if they don't exist"""
         # Create data directory if it doesn't exist
-        if not os.path.exists('data'):
-            os.makedirs('data')
+        if not os.path.exists(os.path.dirname(DB_PATH)):
+            os.makedirs(os.path.dirname(DB_PATH))
             
         # Connect to database
-        conn = sqlite3.connect('data/users.db')
-        cursor = conn.cursor()
-        
-        # Create users table if it doesn't exist
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            first_name TEXT NOT NULL,
-            last_name TEXT NOT NULL,
-            grade TEXT NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-        ''')
-        
-        # Create sessions table to track logins
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS sessions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER,
-            login_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users (id)
-        )
-        ''')
-        
-        conn.commit()
-        conn.close()
+        conn = connect_db()
+        try:
+            cursor = conn.cursor()
+            
+            create_tables(cursor)
+            
+            conn.commit()
+        finally:
+            conn.close()
     
     def get_user_count(self):
         """Get the count of unique users"""
-        conn = sqlite3.connect('data/users.db')
-        cursor = conn.cursor()
-        cursor.execute("SELECT COUNT(*) FROM users")
-        count = cursor.fetchone()[0]
-        conn.close()
+        conn = connect_db()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COUNT(*) FROM users")
+            count = cursor.fetchone()[0]
+        finally:
+            conn.close()
         return count
     
     def login(self):
@@ -304,35 +1793,7 @@ class AuthenticationSystem:
             return
         
         # Store in database
-        conn = sqlite3.connect('data/users.db')
-        cursor = conn.cursor()
-        
-        # Check if user exists
-        cursor.execute(
-            "SELECT id FROM users WHERE first_name = ? AND last_name = ? AND grade = ?", 
-            (first_name, last_name, grade)
-        )
-        user = cursor.fetchone()
-        
-        if user:
-            # User exists, get their ID
-            user_id = user[0]
-        else:
-            # User doesn't exist, create new user
-            cursor.execute(
-                "INSERT INTO users (first_name, last_name, grade) VALUES (?, ?, ?)",
-                (first_name, last_name, grade)
-            )
-            conn.commit()
-            user_id = cursor.lastrowid
-        
-        # Record this session
-        cursor.execute(
-            "INSERT INTO sessions (user_id, login_time) VALUES (?, ?)",
-            (user_id, datetime.datetime.now())
-        )
-        conn.commit()
-        conn.close()
+        user_id = login_user(first_name, last_name, grade)
         
         # Store current user info
         self.current_user = {
@@ -353,7 +1814,12 @@ class AuthenticationSystem:
             self.on_successful_login(self.current_user)
     
     def show_login(self):
-        """Show the login frame"""
+        """Show the login frame, cleared for the next student"""
+        self.current_user = None
+        self.first_name_entry.delete(0, "end")
+        self.last_name_entry.delete(0, "end")
+        self.grade_var.set("")
+        self.stats_label.config(text=f"{self.get_user_count()} explorers have joined this adventure!")
         self.login_frame.pack(fill="both", expand=True)
     
     def get_current_user(self):
@@ -362,42 +1828,14 @@ class AuthenticationSystem:
 
 
 class EmotionDetectorApp:
-    def __init__(self, root, user=None):
+    def __init__(self, root, user=None, event_log=None):
         self.root = root
         self.user = user
-        
-        # Expanded dataset for emotion detection
-        self.data = {
-            "texts": [
-                "I am so happy today!", "This is the best day ever!", "I feel great!",
-                "I am so sad right now.", "This is the worst day.", "I feel terrible.",
-                "I am so angry about this!", "This makes me furious!", "I can't believe this happened.",
-                "The weather is nice today.", "I have no strong feelings about this.", "This is just okay.",
-                "Wow, I didn't expect that!", "This is such a surprise!", "I am shocked!",
-                "I am scared of the dark.", "This is terrifying!", "I feel frightened.",
-                "I am so excited for the trip!", "This is going to be amazing!", "I can't wait!"
-            ],
-            "emotions": [
-                "happy", "happy", "happy",
-                "sad", "sad", "sad",
-                "angry", "angry", "angry",
-                "neutral", "neutral", "neutral",
-                "surprised", "surprised", "surprised",
-                "scared", "scared", "scared",
-                "excited", "excited", "excited"
-            ]
-        }
+        self.event_log = event_log or EventLog(root)
+        self.notifications = NotificationQueue(root)
         
         # Emojis for each emotion
-        self.emotion_emojis = {
-            "happy": "😊",
-            "sad": "😢",
-            "angry": "😡",
-            "neutral": "😐",
-            "surprised": "😮",
-            "scared": "😨",
-            "excited": "🎉"
-        }
+        self.emotion_emojis = EMOTION_EMOJIS
         
         # Kid-friendly emotion descriptions
         self.emotion_descriptions = {
@@ -410,32 +1848,46 @@ class EmotionDetectorApp:
             "excited": "feeling super happy about something that's going to happen"
         }
         
-        # Train a simple Naive Bayes model with TF-IDF
-        self.vectorizer = TfidfVectorizer()
-        self.X = self.vectorizer.fit_transform(self.data["texts"])
-        self.model = MultinomialNB()
-        self.model.fit(self.X, self.data["emotions"])
+        # Index of the training rows for "EmoBot remembers these examples"
+        self.similarity_index = SimilarityIndex()
+        
+        # Best words per emotion for the Emotion Guide, and the labels that show them
+        self.top_words = TopWordsIndex()
+        self.word_names = {}
+        self.guide_word_labels = {}
+        
+        # Built-in examples plus everything taught in earlier sessions, the shared model
+        # and the near-duplicate lookup, see prepare_training_data
+        self.install_training_data(self.prepare_training_data())
+        
+        # Long text analysis that is still running
+        self.long_text_job = None
+        
+        # Live detection state and counters
+        self.live_after_id = None
+        self.live_last_text = None
+        self.live_stats = {"updates": 0, "coalesced": 0, "dropped": 0}
         
         # Global variables for survey responses
         self.pre_survey_responses = {}
         self.post_survey_responses = {}
         
         # Gamification variables
-        self.points = 0
-        self.badges = []
-        self.progress = 0
-        self.challenges = {
-            "detect_5_in_a_row": {"goal": 5, "progress": 0, "completed": False},
-            "train_10_examples": {"goal": 10, "progress": 0, "completed": False}
-        }
+        self.autosave_id = None
+        self.reset_user_state()
+        
+        # Pick up where the student left off last time
+        if self.user:
+            self.restore_user_state()
         
         # Storyline variables
-        self.storyline = [
+        self.storyline_intro = [
             "Welcome to the world of AI! 🌍",
             "You are training a robot named 'EmoBot' to understand feelings.",
             "Help EmoBot learn by detecting emotions and adding training data.",
             "Complete challenges to unlock rewards and become an AI expert!"
         ]
+        self.storyline = collections.deque(self.storyline_intro, maxlen=STORYLINE_SETTINGS["max_lines"])
         
         # Fun Facts about AI
         self.fun_facts = [
@@ -455,6 +1907,124 @@ class EmotionDetectorApp:
         self.pages = {}
         self.create_pages()
         
+    @staticmethod
+    def read_training_data():
+        """
+        The built-in examples and the saved ones, as lists by column
+        The built-in ones have no id; examples from the teacher have no user id
+        """
+        data = {
+            "ids": [None] * len(SEED_DATA["texts"]),
+            "user_ids": [None] * len(SEED_DATA["texts"]),
+            "texts": list(SEED_DATA["texts"]),
+            "emotions": list(SEED_DATA["emotions"])
+        }
+        try:
+            for example_id, user_id, text, emotion in load_training_examples():
+                data["ids"].append(example_id)
+                data["user_ids"].append(user_id)
+                data["texts"].append(text)
+                data["emotions"].append(emotion)
+        except Exception as e:
+            print(f"Error loading training examples: {e}")
+        return data
+    
+    @staticmethod
+    def fit_shared_model(data):
+        """
+        A new feature pipeline (see FEATURE_SETTINGS), the feature rows of every example and a
+        Naive Bayes model fit on the built-in and imported ones; each student's own examples are
+        an overlay on top
+        """
+        # The vocabulary comes from every example, so all overlays share the model's feature columns
+        vectorizer = FeaturePipeline()
+        X = vectorizer.fit_transform(data["texts"])
+        shared = [row for row, owner in enumerate(data["user_ids"]) if owner is None]
+        model = CLASSIFIER_BACKENDS[MODEL_SETTINGS["backend"]]()
+        model.fit(X[shared], [data["emotions"][row] for row in shared])
+        return vectorizer, model, X
+    
+    def prepare_training_data(self):
+        """
+        Read every example and fit a new shared model and near-duplicate lookup on them
+        Nothing the window uses is touched, so a worker thread can do the slow part of a reload;
+        install_training_data then switches the app over
+        """
+        data = self.read_training_data()
+        vectorizer, model, X = self.fit_shared_model(data)
+        
+        # Near-duplicate lookup for the shared examples, so repeated sentences don't grow the corpus
+        duplicate_index = DuplicateIndex()
+        shared = [row for row, owner in enumerate(data["user_ids"]) if owner is None]
+        duplicate_index.add_many([data["texts"][row] for row in shared], [data["emotions"][row] for row in shared])
+        return {"data": data, "vectorizer": vectorizer, "model": model, "X": X, "duplicate_index": duplicate_index}
+    
+    def install_training_data(self, prepared):
+        """Switch to examples and a model from prepare_training_data, with the student's overlay on top"""
+        self.data = prepared["data"]
+        self.vectorizer, self.model, self.X = prepared["vectorizer"], prepared["model"], prepared["X"]
+        self.duplicate_index = prepared["duplicate_index"]
+        self.build_overlay()
+        self.similarity_index.rebuild(self.X)
+    
+    def reload_training_data(self):
+        """Pick up examples added to the database behind the app's back, e.g. by a bulk import"""
+        self.install_training_data(self.prepare_training_data())
+    
+    def build_overlay(self):
+        """Collect the current student's saved examples into their overlay on the shared model"""
+        user_id = self.user["id"] if self.user else None
+        self.overlay = StudentOverlay(self.model.classes_, self.X.shape[1])
+        self.own_duplicates = DuplicateIndex()
+        
+        # Students see the shared examples and their own, never another student's
+        self.visible_rows = np.array([owner is None or owner == user_id for owner in self.data["user_ids"]],
+                                     dtype=bool)
+        if user_id is not None:
+            rows = [row for row, owner in enumerate(self.data["user_ids"]) if owner == user_id]
+            if rows:
+                self.overlay.add(self.X[rows], [self.data["emotions"][row] for row in rows])
+            for row in rows:
+                self.own_duplicates.add(self.data["texts"][row], self.data["emotions"][row])
+        
+        self.top_words.rebuild(self.word_counts(), self.model.alpha)
+        self.refresh_emotion_guide()
+    
+    def word_counts(self, columns=None):
+        """Per-emotion word counts of the shared model plus the student's overlay"""
+        if columns is None:
+            return self.model.feature_count_ + self.overlay.feature_count.toarray()
+        return self.model.feature_count_[:, columns] + self.overlay.feature_count[:, columns].toarray()
+    
+    def update_top_words(self, rows):
+        """Rescore only the words in training rows that were just added or removed"""
+        columns = np.unique(rows.indices)
+        if not self.top_words.update(columns, self.word_counts(columns)):
+            self.top_words.rebuild(self.word_counts(), self.model.alpha)
+        self.refresh_emotion_guide()
+    
+    def refresh_emotion_guide(self):
+        """Show the current best words of each emotion in the Emotion Guide"""
+        if not self.guide_word_labels:
+            return
+        shown = {emotion: self.top_words.top(i) for i, emotion in enumerate(self.model.classes_)}
+        
+        # Hashed columns are named from the examples this student can see, newest first
+        if self.vectorizer.fixed:
+            columns = {column for top in shown.values() for column in top}
+            missing = columns - self.word_names.keys()
+            if missing:
+                texts = (self.data["texts"][row] for row in np.flatnonzero(self.visible_rows)[::-1])
+                self.word_names.update(self.vectorizer.find_names(missing, texts))
+            self.word_names = {column: self.word_names[column] for column in columns if column in self.word_names}
+            names = lambda top: [self.word_names.get(column, "?") for column in top]
+        else:
+            names = lambda top: list(self.vectorizer.vocabulary_names[top])
+        
+        for emotion, label in self.guide_word_labels.items():
+            top = shown.get(emotion)
+            label.config(text=f"Top words: {', '.join(names(top))}" if top else "")
+    
     def create_pages(self):
         self.pages = {
             "welcome": self.create_welcome_page(),
@@ -475,13 +2045,85 @@ class EmotionDetectorApp:
     
     def personalize_welcome_page(self):
         """Personalize welcome page with user information"""
-        # Find the welcome label in the scrollable frame
-        for child in self.pages["welcome"].winfo_children():
-            if isinstance(child, tk.Canvas):
-                interior = child.winfo_children()[0]  # Get the interior frame
-                welcome_label = interior.winfo_children()[0]  # First child should be the welcome label
-                welcome_label.config(text=f"Welcome to the AI Emotion Detector, {self.user['first_name']}! 🧠")
-                break
+        self.welcome_label.config(text=f"Welcome to the AI Emotion Detector, {self.user['first_name']}! 🧠")
+    
+    def greeting_text(self):
+        if self.user:
+            return f"Hello, {self.user['first_name']}! Let's explore AI emotions!"
+        return "Hello! Let's explore AI emotions!"
+    
+    def set_user(self, user):
+        """
+        Switch to another student without rebuilding the pages or the model
+        Only the per-student state and the widgets that show it are reset
+        """
+        self.user = user
+        self.reset_user_state()
+        if self.user:
+            self.restore_user_state()
+        self.build_overlay()
+        
+        # Refresh the widgets that show per-student state
+        self.greeting_label.config(text=self.greeting_text())
+        self.points_label.config(text=f"Points: {self.points}")
+        self.progress_bar["value"] = min(self.progress, 100)
+        self.challenge_panel.refresh(self.challenges)
+        
+        self.storyline.clear()
+        self.storyline.extend(self.storyline_intro)
+        self.storyline_text.config(state="normal")
+        self.storyline_text.delete("1.0", "end")
+        self.storyline_text.insert("end", "\n".join(self.storyline))
+        self.storyline_text.config(state="disabled")
+        
+        # Clear the last student's answers and text
+        for responses in (self.pre_survey_responses, self.post_survey_responses):
+            for var in responses.values():
+                if isinstance(var, tk.StringVar):
+                    var.set("")
+                else:
+                    var.delete(0, "end")
+        self.input_text.delete("1.0", "end")
+        self.input_text.insert("1.0", "Example: I am so happy today!")
+        self.training_text.delete("1.0", "end")
+        self.training_text.insert("1.0", "Example: I feel excited about my birthday!")
+        self.emotion_var.set("")
+        self.result_label.config(text="AI will detect your emotion here", fg=COLORS["text"])
+        self.explanation_label.config(text="After you enter text, I'll explain how I detected the emotion!")
+        self.confidence_label.config(text="")
+        self.live_last_text = None
+        self.cancel_long_text()
+        self.timeline_text.config(state="normal")
+        self.timeline_text.delete("1.0", "end")
+        self.timeline_text.insert("1.0", "Paste a whole story and I'll show the feeling of every sentence!")
+        self.timeline_text.config(state="disabled")
+        self.word_importance_label.config(text="I'll show which words helped me most in making my decision!")
+        self.similar_label.config(text="I'll show the examples I learned from that look most like your text!")
+        self.show_fun_fact()
+    
+    def logout(self):
+        """Save the student's work and hide the app until the next login"""
+        self.autosave_state()
+        self.event_log.flush()
+        self.main_frame.pack_forget()
+        self.user = None
+    
+    def reset_user_state(self):
+        """Start the gamification state from zero"""
+        self.points = 0
+        self.badges = []
+        self.progress = 0
+        self.progress_completed = False
+        self.challenges = {
+            key: {"goal": challenge["goal"], "progress": 0, "completed": False}
+            for key, challenge in CHALLENGES.items()
+        }
+        self.saved_state = {}
+        self.taught_ids = []   # Examples this student added, newest last, for undo
+        self.taught_challenges = {}  # Example id -> challenges it counted towards, taken back on undo
+        if self.autosave_id:
+            self.root.after_cancel(self.autosave_id)
+            self.autosave_id = None
     
     def show_page(self, page):
         """Show a page and reset scroll position to top"""
@@ -501,22 +2143,22 @@ class EmotionDetectorApp:
         canvas, content_frame = create_scrollable_frame(frame)
         
         # Add colorful welcome message
-        welcome_label = tk.Label(content_frame, text="Welcome to the AI Emotion Detector! 🧠", 
-                              font=FONTS["title"], bg=COLORS["background"], fg=COLORS["primary"])
-        welcome_label.pack(pady=40)
+        self.welcome_label = tk.Label(content_frame, text="Welcome to the AI Emotion Detector! 🧠", 
+                              font=get_font("title"), bg=COLORS["background"], fg=COLORS["primary"])
+        self.welcome_label.pack(pady=40)
         
         # Add robot character
-        robot_label = tk.Label(content_frame, text="🤖", font=("Arial", 72), bg=COLORS["background"])
+        robot_label = tk.Label(content_frame, text="🤖", font=get_font(("Arial", 72)), bg=COLORS["background"])
         robot_label.pack(pady=20)
         
         # Add explanation
         explanation = tk.Label(content_frame, 
                             text="Get ready to teach a robot how to understand feelings!\nAre you up for the challenge?", 
-                            font=FONTS["normal"], bg=COLORS["background"], fg=COLORS["text"])
+                            font=get_font("normal"), bg=COLORS["background"], fg=COLORS["text"])
         explanation.pack(pady=20)
         
         # Add next button with bounce effect
-        next_button = BouncingButton(content_frame, text="Let's Go! →", font=FONTS["subtitle"], 
+        next_button = BouncingButton(content_frame, text="Let's Go! →", font=get_font("subtitle"), 
                                   bg=COLORS["secondary"], fg="white", 
                                   command=lambda: self.show_page("pre_survey"))
         next_button.pack(pady=20)
@@ -534,15 +2176,15 @@ class EmotionDetectorApp:
         title_frame.pack(pady=20)
         
         title_label = tk.Label(title_frame, text="AI Explorer Survey ", 
-                            font=FONTS["title"], bg=COLORS["background"], fg=COLORS["primary"])
+                            font=get_font("title"), bg=COLORS["background"], fg=COLORS["primary"])
         title_label.pack(side="left")
         
-        robot_label = tk.Label(title_frame, text="🤖", font=("Arial", 32), bg=COLORS["background"])
+        robot_label = tk.Label(title_frame, text="🤖", font=get_font(("Arial", 32)), bg=COLORS["background"])
         robot_label.pack(side="left", padx=10)
         
         # Add subtitle
         subtitle = tk.Label(content_frame, text="What do you know about AI?", 
-                         font=FONTS["subtitle"], bg=COLORS["background"], fg=COLORS["text"])
+                         font=get_font("subtitle"), bg=COLORS["background"], fg=COLORS["text"])
         subtitle.pack(pady=10)
         
         # Create colorful question frames
@@ -551,7 +2193,7 @@ class EmotionDetectorApp:
         q1_frame.pack(pady=15, padx=30, fill="x")
         
         q1_label = tk.Label(q1_frame, text="1. Have you heard of AI before?", 
-                         font=FONTS["normal"], bg=COLORS["accent"])
+                         font=get_font("normal"), bg=COLORS["accent"])
         q1_label.pack(pady=10, padx=10, anchor="w")
         
         q1_options_frame = tk.Frame(q1_frame, bg=COLORS["accent"])
@@ -560,7 +2202,7 @@ class EmotionDetectorApp:
         q1_var = tk.StringVar()
         for i, option in enumerate(["Yes! 👍", "No 🤔", "Maybe 🤷"]):
             rb = tk.Radiobutton(q1_options_frame, text=option, variable=q1_var, value=option, 
-                             font=FONTS["normal"], bg=COLORS["accent"], 
+                             font=get_font("normal"), bg=COLORS["accent"], 
                              activebackground=COLORS["accent"])
             rb.pack(side="left", padx=20)
         self.pre_survey_responses["q1"] = q1_var
@@ -570,7 +2212,7 @@ class EmotionDetectorApp:
         q2_frame.pack(pady=15, padx=30, fill="x")
         
         q2_label = tk.Label(q2_frame, text="2. What do you think AI does?", 
-                         font=FONTS["normal"], bg="#B5EAD7")
+                         font=get_font("normal"), bg="#B5EAD7")
         q2_label.pack(pady=10, padx=10, anchor="w")
         
         q2_options_frame = tk.Frame(q2_frame, bg="#B5EAD7")
@@ -586,7 +2228,7 @@ class EmotionDetectorApp:
         
         for i, option in enumerate(options):
             rb = tk.Radiobutton(q2_options_frame, text=option, variable=q2_var, value=option, 
-                             font=FONTS["normal"], bg="#B5EAD7", 
+                             font=get_font("normal"), bg="#B5EAD7", 
                              activebackground="#B5EAD7")
             rb.grid(row=i//2, column=i%2, padx=20, pady=5, sticky="w")
         self.pre_survey_responses["q2"] = q2_var
@@ -596,15 +2238,15 @@ class EmotionDetectorApp:
         q3_frame.pack(pady=15, padx=30, fill="x")
         
         q3_label = tk.Label(q3_frame, text="3. Can you name an example of AI you've seen or used?", 
-                         font=FONTS["normal"], bg="#C7CEEA")
+                         font=get_font("normal"), bg="#C7CEEA")
         q3_label.pack(pady=10, padx=10, anchor="w")
         
-        q3_entry = tk.Entry(q3_frame, font=FONTS["normal"], width=40)
+        q3_entry = tk.Entry(q3_frame, font=get_font("normal"), width=40)
         q3_entry.pack(pady=10, padx=20)
         self.pre_survey_responses["q3"] = q3_entry
         
         # Next button
-        next_button = BouncingButton(content_frame, text="Next Step! →", font=FONTS["subtitle"], 
+        next_button = BouncingButton(content_frame, text="Next Step! →", font=get_font("subtitle"), 
                                    bg=COLORS["secondary"], fg="white",
                                    command=lambda: self.show_page("instructions"))
         next_button.pack(pady=20)
@@ -619,7 +2261,7 @@ class EmotionDetectorApp:
         
         # Add title
         title_label = tk.Label(content_frame, text="How to Use EmoBot 🤖", 
-                            font=FONTS["title"], bg=COLORS["background"], fg=COLORS["primary"])
+                            font=get_font("title"), bg=COLORS["background"], fg=COLORS["primary"])
         title_label.pack(pady=20)
         
         # Create instruction cards
@@ -663,21 +2305,21 @@ class EmotionDetectorApp:
             title_frame.pack(pady=5, padx=10, fill="x")
             
             icon_label = tk.Label(title_frame, text=instruction["icon"], 
-                               font=("Arial", 32), bg=instruction_colors[i % len(instruction_colors)])
+                               font=get_font(("Arial", 32)), bg=instruction_colors[i % len(instruction_colors)])
             icon_label.pack(side="left", padx=10)
             
             title_label = tk.Label(title_frame, text=instruction["title"], 
-                                font=FONTS["subtitle"], bg=instruction_colors[i % len(instruction_colors)])
+                                font=get_font("subtitle"), bg=instruction_colors[i % len(instruction_colors)])
             title_label.pack(side="left", padx=10)
             
             # Description
             desc_label = tk.Label(card_frame, text=instruction["text"], 
-                               font=FONTS["normal"], bg=instruction_colors[i % len(instruction_colors)], 
+                               font=get_font("normal"), bg=instruction_colors[i % len(instruction_colors)], 
                                wraplength=550, justify="left")
             desc_label.pack(pady=10, padx=20, fill="x")
         
         # Start button
-        start_button = BouncingButton(content_frame, text="Start Adventure! 🚀", font=FONTS["subtitle"], 
+        start_button = BouncingButton(content_frame, text="Start Adventure! 🚀", font=get_font("subtitle"), 
                                     bg=COLORS["secondary"], fg="white",
                                     command=lambda: self.show_page("main_app"))
         start_button.pack(pady=20)
@@ -691,11 +2333,9 @@ class EmotionDetectorApp:
         canvas, content_frame = create_scrollable_frame(frame)
         
         # Add personalized greeting
-        if self.user:
-            greeting_label = tk.Label(content_frame, 
-                                    text=f"Hello, {self.user['first_name']}! Let's explore AI emotions!", 
-                                    font=FONTS["subtitle"], bg=COLORS["background"], fg=COLORS["primary"])
-            greeting_label.pack(pady=15, padx=20)
+        self.greeting_label = tk.Label(content_frame, text=self.greeting_text(), 
+                                font=get_font("subtitle"), bg=COLORS["background"], fg=COLORS["primary"])
+        self.greeting_label.pack(pady=15, padx=20)
         
         # Header section with points and progress
         header_frame = tk.Frame(content_frame, bg=COLORS["background"])
@@ -706,7 +2346,7 @@ class EmotionDetectorApp:
         points_frame.pack(side="left", padx=10)
         
         self.points_label = tk.Label(points_frame, text=f"Points: {self.points}", 
-                                   font=FONTS["normal"], bg="#FFD166", fg=COLORS["text"])
+                                   font=get_font("normal"), bg="#FFD166", fg=COLORS["text"])
         self.points_label.pack(pady=5, padx=10)
         
         # Progress bar
@@ -714,35 +2354,34 @@ class EmotionDetectorApp:
         progress_frame.pack(side="right", fill="x", expand=True, padx=10)
         
         progress_label = tk.Label(progress_frame, text="Your AI Learning Progress:", 
-                                font=FONTS["small"], bg=COLORS["background"])
+                                font=get_font("small"), bg=COLORS["background"])
         progress_label.pack(anchor="w")
         
         self.progress_bar = ttk.Progressbar(progress_frame, orient="horizontal", length=400, mode="determinate")
         self.progress_bar.pack(fill="x")
-        self.progress_bar["value"] = self.progress
+        self.progress_bar["value"] = min(self.progress, 100)
         
         # Storyline section
         storyline_frame = tk.LabelFrame(content_frame, text="EmoBot's Adventure 📖", 
-                                      font=FONTS["subtitle"], bg="#E2F0CB", bd=2)
+                                      font=get_font("subtitle"), bg="#E2F0CB", bd=2)
         storyline_frame.pack(pady=15, padx=20, fill="x")
         
         self.storyline_text = tk.Text(storyline_frame, height=5, width=60, 
-                                    font=FONTS["normal"], wrap="word", 
+                                    font=get_font("normal"), wrap="word", 
                                     bg="#E2F0CB", bd=0)
         self.storyline_text.pack(pady=10, padx=10, fill="x")
         
         # Insert initial storyline
-        for line in self.storyline:
-            self.storyline_text.insert("end", f"{line}\n")
+        self.storyline_text.insert("end", "\n".join(self.storyline))
         self.storyline_text.config(state="disabled")  # Make read-only
         
         # Fun fact section
         fun_fact_frame = tk.LabelFrame(content_frame, text="Fun AI Fact 💡", 
-                                     font=FONTS["subtitle"], bg="#B5EAD7", bd=2)
+                                     font=get_font("subtitle"), bg="#B5EAD7", bd=2)
         fun_fact_frame.pack(pady=15, padx=20, fill="x")
         
         self.fun_fact_label = tk.Label(fun_fact_frame, text="", 
-                                     font=FONTS["normal"], bg="#B5EAD7", 
+                                     font=get_font("normal"), bg="#B5EAD7", 
                                      wraplength=600, justify="left")
         self.fun_fact_label.pack(pady=10, padx=10)
         self.show_fun_fact()  # Show initial fun fact
@@ -761,11 +2400,11 @@ class EmotionDetectorApp:
         
         # Input section
         input_frame = tk.LabelFrame(left_col, text="Tell EmoBot how you feel 💬", 
-                                  font=FONTS["subtitle"], bg="#FFDAC1", bd=2)
+                                  font=get_font("subtitle"), bg="#FFDAC1", bd=2)
         input_frame.pack(pady=10, fill="x")
         
-        input_text = tk.Text(input_frame, height=4, width=30, 
-                           font=FONTS["normal"], bd=2, relief="solid")
+        self.input_text = input_text = tk.Text(input_frame, height=4, width=30, 
+                           font=get_font("normal"), bd=2, relief="solid")
         input_text.pack(pady=10, padx=10, fill="x")
         
         input_text.insert("1.0", "Example: I am so happy today!")  # Example text
@@ -775,85 +2414,100 @@ class EmotionDetectorApp:
         button_frame.pack(pady=10)
         
         detect_button = BouncingButton(button_frame, text="Detect Emotion! 🔍", 
-                                     font=FONTS["normal"], bg=COLORS["secondary"], fg="white",
+                                     font=get_font("normal"), bg=COLORS["secondary"], fg="white",
                                      command=lambda: self.detect_emotion(input_text))
         detect_button.pack()
         
+        # Live mode guesses the emotion while the student types
+        self.live_var = tk.BooleanVar(value=False)
+        live_check = tk.Checkbutton(input_frame, text="Live mode ⚡ (guess while I type)", 
+                                    variable=self.live_var, font=get_font("small"), 
+                                    bg="#FFDAC1", activebackground="#FFDAC1")
+        live_check.pack(pady=2)
+        
+        self.live_status_label = tk.Label(input_frame, text="", font=get_font("small"), 
+                                          bg="#FFDAC1", fg=COLORS["text"])
+        self.live_status_label.pack(pady=2)
+        
+        input_text.bind("<KeyRelease>", self.schedule_live_detection)
+        
         # Result section
         result_frame = tk.Frame(left_col, bg="#FFB7B2", bd=2, relief="raised")
         result_frame.pack(pady=10, fill="x")
         
         self.result_label = tk.Label(result_frame, text="AI will detect your emotion here", 
-                                   font=FONTS["subtitle"], bg="#FFB7B2", fg=COLORS["text"])
+                                   font=get_font("subtitle"), bg="#FFB7B2", fg=COLORS["text"])
         self.result_label.pack(pady=15, padx=10)
         
+        # Emotion timeline for long texts, filled one sentence at a time
+        timeline_frame = tk.LabelFrame(left_col, text="Emotion Timeline 📈", 
+                                     font=get_font("subtitle"), bg="#FFDAC1", bd=2)
+        timeline_frame.pack(pady=10, fill="x")
+        
+        self.timeline_text = tk.Text(timeline_frame, height=6, width=30, 
+                                   font=get_font("small"), wrap="word", bg="#FFDAC1", bd=0)
+        self.timeline_text.pack(pady=10, padx=10, fill="x")
+        self.timeline_text.insert("1.0", "Paste a whole story and I'll show the feeling of every sentence!")
+        self.timeline_text.config(state="disabled")
+        
         # Explanation section
         explanation_frame = tk.LabelFrame(left_col, text="How EmoBot thinks 🧠", 
-                                        font=FONTS["subtitle"], bg="#C7CEEA", bd=2)
+                                        font=get_font("subtitle"), bg="#C7CEEA", bd=2)
         explanation_frame.pack(pady=10, fill="x")
         
         self.explanation_label = tk.Label(explanation_frame, text="After you enter text, I'll explain how I detected the emotion!", 
-                                       font=FONTS["normal"], bg="#C7CEEA", 
+                                       font=get_font("normal"), bg="#C7CEEA", 
                                        wraplength=300, justify="left")
         self.explanation_label.pack(pady=10, padx=10)
         
+        # Confidence bars get their own label so they can be updated in place
+        self.confidence_label = tk.Label(explanation_frame, text="", 
+                                      font=get_font("normal"), bg="#C7CEEA", justify="left")
+        self.confidence_label.pack(pady=(0, 10), padx=10)
+        
         # Word importance section
         word_importance_frame = tk.LabelFrame(left_col, text="Important Words 📊", 
-                                           font=FONTS["subtitle"], bg="#B5EAD7", bd=2)
+                                           font=get_font("subtitle"), bg="#B5EAD7", bd=2)
         word_importance_frame.pack(pady=10, fill="x")
         
         self.word_importance_label = tk.Label(word_importance_frame, 
                                           text="I'll show which words helped me most in making my decision!", 
-                                          font=FONTS["normal"], bg="#B5EAD7", 
+                                          font=get_font("normal"), bg="#B5EAD7", 
                                           wraplength=300, justify="left")
         self.word_importance_label.pack(pady=10, padx=10)
         
-        # Challenges section
-        self.challenge_frame = tk.LabelFrame(right_col, text="Your Missions 🚀", 
-                                          font=FONTS["subtitle"], bg="#FFD166", bd=2)
-        self.challenge_frame.pack(pady=10, fill="x")
+        # Similar examples section
+        similar_frame = tk.LabelFrame(left_col, text="EmoBot remembers these examples 💭", 
+                                    font=get_font("subtitle"), bg="#E2F0CB", bd=2)
+        similar_frame.pack(pady=10, fill="x")
         
-        # Add challenge title
-        title_label = tk.Label(self.challenge_frame, text="Challenges:", 
-                            font=FONTS["subtitle"], bg="#FFD166")
-        title_label.pack(pady=5)
+        self.similar_label = tk.Label(similar_frame, 
+                                   text="I'll show the examples I learned from that look most like your text!", 
+                                   font=get_font("normal"), bg="#E2F0CB", 
+                                   wraplength=300, justify="left")
+        self.similar_label.pack(pady=10, padx=10)
         
-        # Add challenge labels
-        for key, challenge in self.challenges.items():
-            # Create frame for each challenge
-            c_frame = tk.Frame(self.challenge_frame, bg="#FFD166")
-            c_frame.pack(fill="x", pady=5)
-            
-            # Add emoji based on progress
-            emoji = "🔴"  # Not started
-            if challenge["completed"]:
-                emoji = "✅"  # Completed
-            elif challenge["progress"] > 0:
-                emoji = "🟡"  # In progress
-                
-            # Create label
-            c_label = tk.Label(c_frame, 
-                             text=f"{emoji} {key.replace('_', ' ').title()}: {challenge['progress']}/{challenge['goal']}", 
-                             font=FONTS["normal"], bg="#FFD166")
-            c_label.pack(pady=2)
+        # Challenges section
+        self.challenge_panel = ChallengePanel(right_col, self.challenges)
+        self.challenge_panel.pack(pady=10, fill="x")
         
         # Training section
         training_frame = tk.LabelFrame(right_col, text="Train EmoBot 🧠", 
-                                     font=FONTS["subtitle"], bg="#E2F0CB", bd=2)
+                                     font=get_font("subtitle"), bg="#E2F0CB", bd=2)
         training_frame.pack(pady=10, fill="x")
         
         training_label = tk.Label(training_frame, 
                                text="Help EmoBot learn by adding more examples of emotions!", 
-                               font=FONTS["normal"], bg="#E2F0CB", 
+                               font=get_font("normal"), bg="#E2F0CB", 
                                wraplength=300, justify="left")
         training_label.pack(pady=10, padx=10)
         
         text_label = tk.Label(training_frame, text="Enter Text:", 
-                           font=FONTS["normal"], bg="#E2F0CB")
+                           font=get_font("normal"), bg="#E2F0CB")
         text_label.pack(pady=5, padx=10, anchor="w")
         
-        training_text = tk.Text(training_frame, height=3, width=30, 
-                              font=FONTS["normal"], bd=2, relief="solid")
+        self.training_text = training_text = tk.Text(training_frame, height=3, width=30, 
+                              font=get_font("normal"), bd=2, relief="solid")
         training_text.pack(pady=5, padx=10, fill="x")
         
         training_text.insert("1.0", "Example: I feel excited about my birthday!")  # Example text
@@ -862,13 +2516,13 @@ class EmotionDetectorApp:
         emotion_frame.pack(pady=5, padx=10, fill="x")
         
         emotion_label = tk.Label(emotion_frame, text="Select Emotion:", 
-                              font=FONTS["normal"], bg="#E2F0CB")
+                              font=get_font("normal"), bg="#E2F0CB")
         emotion_label.pack(side="left", pady=5)
         
-        emotion_var = tk.StringVar()
+        self.emotion_var = emotion_var = tk.StringVar()
         emotion_dropdown = ttk.Combobox(emotion_frame, textvariable=emotion_var, 
                                       values=list(self.emotion_emojis.keys()), 
-                                      font=FONTS["normal"], width=12)
+                                      font=get_font("normal"), width=12)
         emotion_dropdown.pack(side="left", padx=10)
         
         # Create frame for button
@@ -876,13 +2530,18 @@ class EmotionDetectorApp:
         train_button_frame.pack(pady=10)
         
         add_data_button = BouncingButton(train_button_frame, text="Teach EmoBot! 📚", 
-                                       font=FONTS["normal"], bg=COLORS["primary"], fg="white",
+                                       font=get_font("normal"), bg=COLORS["primary"], fg="white",
                                        command=lambda: self.add_training_data(training_text, emotion_var))
-        add_data_button.pack()
+        add_data_button.pack(side="left", padx=5)
+        
+        undo_button = BouncingButton(train_button_frame, text="Undo ↩️", 
+                                   font=get_font("normal"), bg=COLORS["accent"], fg=COLORS["text"],
+                                   command=self.undo_training_data)
+        undo_button.pack(side="left", padx=5)
         
         # Emotion guide section
         emotions_frame = tk.LabelFrame(right_col, text="Emotion Guide 📖", 
-                                     font=FONTS["subtitle"], bg="#FFB7B2", bd=2)
+                                     font=get_font("subtitle"), bg="#FFB7B2", bd=2)
         emotions_frame.pack(pady=10, fill="x")
         
         # Add each emotion with description
@@ -891,22 +2550,29 @@ class EmotionDetectorApp:
             emotion_row.pack(pady=5, padx=5, fill="x")
             
             emotion_emoji = tk.Label(emotion_row, text=emoji, 
-                                   font=("Arial", 24), bg="#FFB7B2")
+                                   font=get_font(("Arial", 24)), bg="#FFB7B2")
             emotion_emoji.pack(side="left", padx=5)
             
             emotion_name = tk.Label(emotion_row, text=f"{emotion.capitalize()}: ", 
-                                  font=FONTS["normal"], bg="#FFB7B2", fg=COLORS["text"])
+                                  font=get_font("normal"), bg="#FFB7B2", fg=COLORS["text"])
             emotion_name.pack(side="left")
             
             emotion_desc = tk.Label(emotion_row, 
                                   text=self.emotion_descriptions.get(emotion, ""), 
-                                  font=FONTS["small"], bg="#FFB7B2", fg=COLORS["text"], 
+                                  font=get_font("small"), bg="#FFB7B2", fg=COLORS["text"], 
                                   wraplength=200, justify="left")
             emotion_desc.pack(side="left", padx=5)
+            
+            # Words EmoBot currently links most to this emotion, kept up to date as it learns
+            top_words_label = tk.Label(emotions_frame, text="", font=get_font("small"), bg="#FFB7B2",
+                                       fg=COLORS["text"], wraplength=280, justify="left")
+            top_words_label.pack(padx=45, anchor="w")
+            self.guide_word_labels[emotion] = top_words_label
+        self.refresh_emotion_guide()
         
         # Next/Finish button at bottom
         next_button = BouncingButton(content_frame, text="Finish Adventure! 🎉", 
-                                   font=FONTS["subtitle"], bg=COLORS["secondary"], fg="white",
+                                   font=get_font("subtitle"), bg=COLORS["secondary"], fg="white",
                                    command=lambda: self.show_page("post_survey"))
         next_button.pack(pady=20)
         
@@ -923,15 +2589,15 @@ class EmotionDetectorApp:
         title_frame.pack(pady=20)
         
         title_label = tk.Label(title_frame, text="AI Explorer Checkpoint ", 
-                            font=FONTS["title"], bg=COLORS["background"], fg=COLORS["primary"])
+                            font=get_font("title"), bg=COLORS["background"], fg=COLORS["primary"])
         title_label.pack(side="left")
         
-        emoji_label = tk.Label(title_frame, text="🎉", font=("Arial", 32), bg=COLORS["background"])
+        emoji_label = tk.Label(title_frame, text="🎉", font=get_font(("Arial", 32)), bg=COLORS["background"])
         emoji_label.pack(side="left", padx=10)
         
         # Add subtitle
         subtitle = tk.Label(content_frame, text="Tell us what you learned about AI!", 
-                         font=FONTS["subtitle"], bg=COLORS["background"], fg=COLORS["text"])
+                         font=get_font("subtitle"), bg=COLORS["background"], fg=COLORS["text"])
         subtitle.pack(pady=10)
         
         # Create colorful question frames
@@ -940,7 +2606,7 @@ class EmotionDetectorApp:
         q1_frame.pack(pady=15, padx=30, fill="x")
         
         q1_label = tk.Label(q1_frame, text="1. Now that you've played, how would you define AI?", 
-                         font=FONTS["normal"], bg="#FFDAC1")
+                         font=get_font("normal"), bg="#FFDAC1")
         q1_label.pack(pady=10, padx=10, anchor="w")
         
         q1_options_frame = tk.Frame(q1_frame, bg="#FFDAC1")
@@ -956,7 +2622,7 @@ class EmotionDetectorApp:
         
         for i, option in enumerate(options):
             rb = tk.Radiobutton(q1_options_frame, text=option, variable=q1_var, value=option, 
-                             font=FONTS["normal"], bg="#FFDAC1", 
+                             font=get_font("normal"), bg="#FFDAC1", 
                              activebackground="#FFDAC1")
             rb.grid(row=i//2, column=i%2, padx=20, pady=5, sticky="w")
         self.post_survey_responses["q1"] = q1_var
@@ -966,7 +2632,7 @@ class EmotionDetectorApp:
         q2_frame.pack(pady=15, padx=30, fill="x")
         
         q2_label = tk.Label(q2_frame, text="2. What does AI need to learn emotions?", 
-                         font=FONTS["normal"], bg="#E2F0CB")
+                         font=get_font("normal"), bg="#E2F0CB")
         q2_label.pack(pady=10, padx=10, anchor="w")
         
         q2_options_frame = tk.Frame(q2_frame, bg="#E2F0CB")
@@ -982,7 +2648,7 @@ class EmotionDetectorApp:
         
         for i, option in enumerate(options):
             rb = tk.Radiobutton(q2_options_frame, text=option, variable=q2_var, value=option, 
-                             font=FONTS["normal"], bg="#E2F0CB", 
+                             font=get_font("normal"), bg="#E2F0CB", 
                              activebackground="#E2F0CB")
             rb.grid(row=i//2, column=i%2, padx=20, pady=5, sticky="w")
         self.post_survey_responses["q2"] = q2_var
@@ -992,10 +2658,10 @@ class EmotionDetectorApp:
         q3_frame.pack(pady=15, padx=30, fill="x")
         
         q3_label = tk.Label(q3_frame, text="3. Can AI make mistakes? If yes, why?", 
-                         font=FONTS["normal"], bg="#B5EAD7")
+                         font=get_font("normal"), bg="#B5EAD7")
         q3_label.pack(pady=10, padx=10, anchor="w")
         
-        q3_entry = tk.Entry(q3_frame, font=FONTS["normal"], width=40)
+        q3_entry = tk.Entry(q3_frame, font=get_font("normal"), width=40)
         q3_entry.pack(pady=10, padx=20)
         self.post_survey_responses["q3"] = q3_entry
         
@@ -1004,10 +2670,10 @@ class EmotionDetectorApp:
         q4_frame.pack(pady=15, padx=30, fill="x")
         
         q4_label = tk.Label(q4_frame, text="4. What was the most surprising thing you learned about AI?", 
-                         font=FONTS["normal"], bg="#C7CEEA")
+                         font=get_font("normal"), bg="#C7CEEA")
         q4_label.pack(pady=10, padx=10, anchor="w")
         
-        q4_entry = tk.Entry(q4_frame, font=FONTS["normal"], width=40)
+        q4_entry = tk.Entry(q4_frame, font=get_font("normal"), width=40)
         q4_entry.pack(pady=10, padx=20)
         self.post_survey_responses["q4"] = q4_entry
         
@@ -1016,16 +2682,16 @@ class EmotionDetectorApp:
         q5_frame.pack(pady=15, padx=30, fill="x")
         
         q5_label = tk.Label(q5_frame, text="5. If you could improve EmoBot, what would you add?", 
-                         font=FONTS["normal"], bg="#FFB7B2")
+                         font=get_font("normal"), bg="#FFB7B2")
         q5_label.pack(pady=10, padx=10, anchor="w")
         
-        q5_entry = tk.Entry(q5_frame, font=FONTS["normal"], width=40)
+        q5_entry = tk.Entry(q5_frame, font=get_font("normal"), width=40)
         q5_entry.pack(pady=10, padx=20)
         self.post_survey_responses["q5"] = q5_entry
         
         # Submit button
         submit_button = BouncingButton(content_frame, text="Finish Adventure! 🎉", 
-                                     font=FONTS["subtitle"], bg=COLORS["secondary"], fg="white",
+                                     font=get_font("subtitle"), bg=COLORS["secondary"], fg="white",
                                      command=self.show_feedback)
         submit_button.pack(pady=20)
         
@@ -1038,10 +2704,26 @@ class EmotionDetectorApp:
                              icon=messagebox.INFO)
             return
         
+        # A newer click replaces a long text that is still being read
+        self.cancel_long_text()
+        
+        # Long texts are read sentence by sentence in the background
+        sentences = [sentence.strip() for sentence in SENTENCE_SPLIT.split(text) if sentence.strip()]
+        if len(sentences) >= LONG_TEXT_SETTINGS["min_sentences"]:
+            self.start_long_text(text, sentences)
+            return
+        
         # Predict emotion
-        text_vec = self.vectorizer.transform([text])
-        emotion = self.model.predict(text_vec)[0]
-        probabilities = self.model.predict_proba(text_vec)[0]
+        start = time.perf_counter()
+        emotion, probabilities, text_vec = self.predict(text)
+        latency_ms = (time.perf_counter() - start) * 1000
+        
+        self.show_detection("detect", text, emotion, probabilities, text_vec, latency_ms)
+    
+    def show_detection(self, action, text, emotion, probabilities, text_vec, latency_ms):
+        """Show a detection result and award its points"""
+        self.event_log.log(self.user["id"] if self.user else None, action, text,
+                           emotion, float(probabilities.max()), latency_ms)
         
         # Show result with emoji and animation
         result_text = f"AI detects: {emotion.capitalize()} {self.emotion_emojis.get(emotion, '')}"
@@ -1054,34 +2736,178 @@ class EmotionDetectorApp:
         self.explain_ai_process(text, emotion, probabilities, text_vec)
         
         # Visualize word importance with fun animation
-        self.visualize_word_importance(text, text_vec)
+        self.visualize_word_importance(text, emotion, text_vec)
+        
+        # Show the training examples that look most alike
+        self.show_similar_examples(text_vec)
         
         # Award points with celebration
         self.points += 10
         self.update_points(celebration=True)
         
         # Update challenges
-        self.update_challenges("detect_5_in_a_row")
+        self.update_challenges("detect")
         
         # Check for badges
         if self.points >= 50 and "AI Novice" not in self.badges:
             self.badges.append("AI Novice")
-            messagebox.showinfo("Badge Unlocked!", "You unlocked the 'AI Novice' badge! 🎉", 
-                              icon=messagebox.INFO)
+            self.notifications.notify("Badge Unlocked! You unlocked the 'AI Novice' badge! 🎉")
         if self.points >= 100 and "AI Expert" not in self.badges:
             self.badges.append("AI Expert")
-            messagebox.showinfo("Badge Unlocked!", "You unlocked the 'AI Expert' badge! 🎉", 
-                              icon=messagebox.INFO)
+            self.notifications.notify("Badge Unlocked! You unlocked the 'AI Expert' badge! 🎉")
+        
+        # Update progress with animation
+        self.progress += 10
+        self.update_progress()
+        
+        # Update storyline
+        self.update_storyline(f"EmoBot detected: {emotion.capitalize()} {self.emotion_emojis.get(emotion, '')}")
+        
+        # Show a random fun fact
+        self.show_fun_fact()
+    
+    def predict(self, text):
+        """Return the emotion, the probability per class and the feature vector of a text"""
+        text_vec = self.vectorizer.transform([text])
+        # One predict_proba call gives both the probabilities and the winning class
+        probabilities = self.model.predict_proba(text_vec, self.overlay)[0]
+        emotion = self.model.classes_[int(np.argmax(probabilities))]
+        return emotion, probabilities, text_vec
+    
+    def start_long_text(self, text, sentences):
+        """Classify a long text sentence by sentence, streaming results into the timeline"""
+        self.long_text_job = {
+            "text": text,
+            "sentences": sentences,
+            "next": 0,
+            "batch_size": 16,
+            "probability_sum": np.zeros(len(self.model.classes_)),
+            "best": None,         # (confidence, index) of the surest sentence
+            "start": time.perf_counter(),
+            "after_id": None
+        }
+        self.timeline_text.config(state="normal")
+        self.timeline_text.delete("1.0", "end")
+        self.timeline_text.config(state="disabled")
+        self.result_label.config(text=f"EmoBot is reading {len(sentences)} sentences... 📖", fg=COLORS["text"])
+        self.long_text_job["after_id"] = self.root.after_idle(self.continue_long_text)
+    
+    def cancel_long_text(self):
+        if self.long_text_job:
+            if self.long_text_job["after_id"]:
+                self.root.after_cancel(self.long_text_job["after_id"])
+            self.long_text_job = None
+    
+    def continue_long_text(self):
+        """Classify batches of sentences until this tick's time budget is used up"""
+        job = self.long_text_job
+        job["after_id"] = None
+        sentences = job["sentences"]
+        budget = LONG_TEXT_SETTINGS["tick_budget_ms"] / 1000
+        tick_start = time.perf_counter()
+        rows = []
+        
+        while job["next"] < len(sentences) and time.perf_counter() - tick_start < budget:
+            first = job["next"]
+            batch = sentences[first:first + job["batch_size"]]
+            
+            # One transform and one predict_proba for the whole batch
+            batch_start = time.perf_counter()
+            probabilities = self.model.predict_proba(self.vectorizer.transform(batch), self.overlay)
+            batch_time = time.perf_counter() - batch_start
+            
+            # Grow or shrink the batch to fit the time budget
+            if batch_time < budget / 4:
+                job["batch_size"] *= 2
+            elif batch_time > budget / 2 and job["batch_size"] > 1:
+                job["batch_size"] //= 2
+            
+            job["probability_sum"] += probabilities.sum(axis=0)
+            winners = probabilities.argmax(axis=1)
+            for offset, (sentence, winner) in enumerate(zip(batch, winners)):
+                index = first + offset
+                confidence = probabilities[offset, winner]
+                if job["best"] is None or confidence > job["best"][0]:
+                    job["best"] = (confidence, index)
+                if index < LONG_TEXT_SETTINGS["max_timeline_rows"]:
+                    emotion = self.model.classes_[winner]
+                    preview = sentence if len(sentence) <= 40 else sentence[:40] + "…"
+                    rows.append(f"{index + 1}. {self.emotion_emojis.get(emotion, '')} "
+                                f"{emotion.capitalize()} {int(confidence * 100)}% - {preview}\n")
+            job["next"] += len(batch)
+            
+            # Stop early if another batch like this one would overrun the budget
+            if time.perf_counter() - tick_start + batch_time > budget:
+                break
         
-        # Update progress with animation
-        self.progress += 10
-        self.update_progress()
+        # One insert per tick keeps the Text widget cheap to update
+        if rows:
+            self.timeline_text.config(state="normal")
+            self.timeline_text.insert("end", "".join(rows))
+            self.timeline_text.config(state="disabled")
         
-        # Update storyline
-        self.update_storyline(f"EmoBot detected: {emotion.capitalize()} {self.emotion_emojis.get(emotion, '')}")
+        if job["next"] < len(sentences):
+            self.result_label.config(text=f"EmoBot is reading... {job['next']}/{len(sentences)} sentences 📖")
+            job["after_id"] = self.root.after(1, self.continue_long_text)
+            return
         
-        # Show a random fun fact
-        self.show_fun_fact()
+        self.finish_long_text(job)
+    
+    def finish_long_text(self, job):
+        """Show the overall emotion once every sentence has been read"""
+        self.long_text_job = None
+        sentences = job["sentences"]
+        hidden = len(sentences) - LONG_TEXT_SETTINGS["max_timeline_rows"]
+        if hidden > 0:
+            self.timeline_text.config(state="normal")
+            self.timeline_text.insert("end", f"...and {hidden} more sentences\n")
+            self.timeline_text.config(state="disabled")
+        
+        # The overall feeling is the average over all sentences
+        probabilities = job["probability_sum"] / len(sentences)
+        emotion = self.model.classes_[int(np.argmax(probabilities))]
+        latency_ms = (time.perf_counter() - job["start"]) * 1000
+        
+        # Explain with the sentence EmoBot was surest about, so the explanation stays short
+        best_sentence = sentences[job["best"][1]]
+        text_vec = self.vectorizer.transform([best_sentence])
+        self.show_detection("detect_long", job["text"], emotion, probabilities, text_vec, latency_ms)
+    
+    def schedule_live_detection(self, event=None):
+        """Guess again once the student pauses typing, cancelling the older pending guess"""
+        if not self.live_var.get():
+            return
+        if self.live_after_id:
+            self.root.after_cancel(self.live_after_id)
+            self.live_stats["coalesced"] += 1
+        self.live_after_id = self.root.after(LIVE_DETECTION_SETTINGS["debounce_ms"], self.run_live_detection)
+    
+    def run_live_detection(self):
+        """Update the result and confidence bars in place, without points or pop-ups"""
+        self.live_after_id = None
+        text = self.input_text.get("1.0", "end-1c")
+        
+        # Nothing new to show, e.g. after arrow keys or an empty box
+        if not text.strip() or text == self.live_last_text:
+            self.live_stats["dropped"] += 1
+            self.update_live_status()
+            return
+        self.live_last_text = text
+        
+        start = time.perf_counter()
+        emotion, probabilities, text_vec = self.predict(text)
+        result_text = f"AI detects: {emotion.capitalize()} {self.emotion_emojis.get(emotion, '')}"
+        self.result_label.config(text=result_text, fg=COLORS["primary"])
+        self.confidence_label.config(text=self.confidence_bars(probabilities))
+        self.live_stats["updates"] += 1
+        self.update_live_status((time.perf_counter() - start) * 1000)
+    
+    def update_live_status(self, latency_ms=None):
+        stats = self.live_stats
+        status = f"Live: {stats['updates']} updates, {stats['coalesced']} coalesced, {stats['dropped']} dropped"
+        if latency_ms is not None:
+            status += f" ({latency_ms:.1f} ms)"
+        self.live_status_label.config(text=status)
     
     def flash_label(self, label):
         """Create a flashing highlight effect on a label"""
@@ -1102,8 +2928,9 @@ class EmotionDetectorApp:
         
         # Get important words if possible
         try:
-            important_words = self.vectorizer.inverse_transform(text_vec)[0]
-            if important_words:
+            # Only the columns present in the text are looked at, never the whole vocabulary
+            important_words = self.vectorizer.feature_names(text, np.sort(text_vec.indices))
+            if len(important_words):
                 word_list = ", ".join([f"'{word}'" for word in important_words[:3]])
                 explanation += word_list
             else:
@@ -1112,30 +2939,34 @@ class EmotionDetectorApp:
             explanation += "these in your text"
             
         explanation += ".\n\n"
-        explanation += f"EmoBot is {self.emotion_descriptions.get(emotion, 'feeling something')}\n\n"
-        explanation += "EmoBot's confidence levels:\n"
+        explanation += f"EmoBot is {self.emotion_descriptions.get(emotion, 'feeling something')}"
+        
+        self.explanation_label.config(text=explanation)
+        self.confidence_label.config(text=self.confidence_bars(probabilities))
+    
+    def confidence_bars(self, probabilities):
+        """EmoBot's confidence levels as emoji bars, one line per emotion"""
+        bars = "EmoBot's confidence levels:\n"
         
         # Show probabilities with emoji bars
         for i, emotion_class in enumerate(self.model.classes_):
             prob_percent = int(probabilities[i] * 100)
             emoji_bar = "🟦" * (prob_percent // 10 + 1)  # Create emoji bar chart
-            explanation += f"{emotion_class.capitalize()}: {emoji_bar} {prob_percent}%\n"
-            
-        self.explanation_label.config(text=explanation)
+            bars += f"{emotion_class.capitalize()}: {emoji_bar} {prob_percent}%\n"
+        return bars
     
-    def visualize_word_importance(self, text, text_vec):
+    def visualize_word_importance(self, text, emotion, text_vec):
         word_importance_text = "Top words that helped EmoBot decide:\n"
         
         try:
-            # Calculate word importance
-            word_importance = np.array(text_vec.sum(axis=0)).flatten()
-            words = self.vectorizer.get_feature_names_out()
-            
-            # Create word-importance pairs
+            # Create word-importance pairs from how much each word pointed to the guessed emotion
+            names = self.vectorizer.feature_names(text, text_vec.indices)
+            class_index = int(np.searchsorted(self.model.classes_, emotion))
+            contributions = self.model.token_contributions(text_vec, class_index, self.overlay)
             important_words = [
-                (words[i], word_importance[i])
-                for i in range(len(words))
-                if word_importance[i] > 0 and words[i] in text.lower()
+                (word, importance)
+                for word, importance in zip(names, contributions)
+                if importance > 0
             ]
             
             # Sort by importance
@@ -1143,7 +2974,7 @@ class EmotionDetectorApp:
             
             # Display top words with fun emoji indicators
             for word, importance in important_words[:5]:
-                stars = "⭐" * (int(importance * 5) + 1)
+                stars = "⭐" * min(int(importance * 5) + 1, 5)
                 word_importance_text += f"{word}: {stars}\n"
                 
         except Exception as e:
@@ -1153,25 +2984,63 @@ class EmotionDetectorApp:
             
         self.word_importance_label.config(text=word_importance_text)
     
+    def show_similar_examples(self, text_vec):
+        matches = self.similarity_index.query(text_vec, SIMILAR_EXAMPLES_SETTINGS["top_k"], self.visible_rows)
+        if not matches:
+            self.similar_label.config(text="This is new to me! I haven't seen anything like it yet.")
+            return
+        
+        similar_text = "These examples look most like your text:\n"
+        for row, similarity in matches:
+            emotion = self.data["emotions"][row]
+            similar_text += (f"{self.emotion_emojis.get(emotion, '')} \"{self.data['texts'][row]}\" "
+                             f"({int(similarity * 100)}% alike)\n")
+        self.similar_label.config(text=similar_text)
+    
     def add_training_data(self, training_text, emotion_var):
         text = training_text.get("1.0", "end-1c")
         emotion = emotion_var.get()
         if text.strip() and emotion:
+            # An example EmoBot already knows adds nothing, so it isn't stored or rewarded
+            if (self.duplicate_index.find(text, emotion.lower()) is not None
+                    or self.own_duplicates.find(text, emotion.lower()) is not None):
+                self.event_log.log(self.user["id"] if self.user else None, "duplicate", text,
+                                   emotion.lower())
+                self.notifications.notify("EmoBot already knows that one! Try teaching it a new sentence. 🤔")
+                training_text.delete("1.0", "end")
+                return
+            
+            try:
+                example_id = insert_training_example(self.user["id"] if self.user else None, text, emotion.lower())
+            except Exception as e:
+                example_id = None
+                print(f"Error saving training example: {e}")
+            
+            self.data["ids"].append(example_id)
+            self.data["user_ids"].append(self.user["id"] if self.user else None)
             self.data["texts"].append(text)
             self.data["emotions"].append(emotion.lower())
-            self.retrain_model()
+            (self.own_duplicates if self.user else self.duplicate_index).add(text, emotion.lower())
+            start = time.perf_counter()
+            self.learn_example(text, emotion.lower())
+            latency_ms = (time.perf_counter() - start) * 1000
+            
+            self.event_log.log(self.user["id"] if self.user else None, "train", text,
+                               emotion.lower(), None, latency_ms)
             
             # Show success message with animation
-            messagebox.showinfo("Amazing!", "EmoBot learned something new! You're a great teacher! 🎓", 
-                              icon=messagebox.INFO)
+            self.notifications.notify("Amazing! EmoBot learned something new! You're a great teacher! 🎓")
             training_text.delete("1.0", "end")
             
             # Award points with celebration
             self.points += 20
             self.update_points(celebration=True)
             
-            # Update challenges
-            self.update_challenges("train_10_examples")
+            # Update challenges, remembering which ones this example counted for so undo can take it back
+            counted = self.update_challenges("train")
+            if example_id is not None:
+                self.taught_ids.append(example_id)
+                self.taught_challenges[example_id] = counted
             
             # Update progress with animation
             self.progress += 20
@@ -1186,81 +3055,230 @@ class EmotionDetectorApp:
             messagebox.showinfo("Oops!", "Please enter both text and select an emotion! EmoBot needs both to learn. 📚", 
                               icon=messagebox.INFO)
     
+    def undo_training_data(self):
+        """Take back the last example this student taught"""
+        if not self.taught_ids:
+            self.notifications.notify("There's nothing to undo yet! 📚")
+            return
+        
+        example_id = self.taught_ids.pop()
+        emotion = self.remove_training_example(example_id)
+        
+        # Taking a lesson back also takes back its points, progress and challenge steps,
+        # so teaching and undoing the same sentence over and over earns nothing
+        self.points = max(self.points - 20, 0)
+        self.revert_challenges(self.taught_challenges.pop(example_id, []))
+        self.update_points()
+        self.progress = max(self.progress - 20, 0)
+        self.update_progress()
+        self.notifications.notify("EmoBot forgot your last example. ↩️")
+        if emotion:
+            self.update_storyline(f"EmoBot forgot: {emotion.capitalize()} {self.emotion_emojis.get(emotion, '')}")
+    
+    def remove_training_example(self, example_id):
+        """
+        Remove a saved training example from the model and the database
+        Its counts are subtracted from the model instead of refitting it
+        Returns the emotion of the removed example, or None if it wasn't loaded
+        """
+        delete_training_example(example_id)
+        if example_id not in self.data["ids"]:
+            return None
+        
+        row = self.data["ids"].index(example_id)
+        emotion = self.data["emotions"][row]
+        text = self.data["texts"][row]
+        owner = self.data["user_ids"][row]
+        start = time.perf_counter()
+        
+        # A negative weight subtracts the row's term and class counts from the model or overlay it is in
+        needs_refit = False
+        removed_row = self.X[row]
+        if owner is None:
+            self.duplicate_index.remove(text, emotion)
+            shared_count = sum(1 for e, u in zip(self.data["emotions"], self.data["user_ids"])
+                               if e == emotion and u is None)
+            if shared_count > 1:
+                self.model.partial_fit(removed_row, [emotion], sample_weight=[-1.0])
+            else:
+                # The last example of an emotion removes the emotion itself, which needs a refit
+                needs_refit = True
+        elif self.user and owner == self.user["id"]:
+            self.own_duplicates.remove(text, emotion)
+            self.overlay.add(removed_row, [emotion], weight=-1.0)
+        
+        for key in ("ids", "user_ids", "texts", "emotions"):
+            del self.data[key][row]
+        if needs_refit:
+            self.retrain_model()
+        else:
+            keep = np.ones(self.X.shape[0], dtype=bool)
+            keep[row] = False
+            self.X = self.X[keep]
+            self.visible_rows = self.visible_rows[keep]
+            self.similarity_index.rebuild(self.X)
+            self.update_top_words(removed_row)
+        
+        latency_ms = (time.perf_counter() - start) * 1000
+        self.event_log.log(self.user["id"] if self.user else None, "untrain", None,
+                           emotion, None, latency_ms)
+        return emotion
+    
+    def learn_example(self, text, emotion):
+        """
+        Add the newest example to the student's overlay, or to the shared model when nobody is logged in,
+        without a refit
+        With a learned vocabulary the example is added with the words EmoBot already knows; its new words
+        join the vocabulary at the next refit (app start, import, or removing an emotion's last example),
+        like removed examples leave it
+        """
+        if emotion not in self.model.classes_:
+            self.retrain_model()
+            return
+        row = self.vectorizer.transform([text])
+        if row.nnz == 0 and not self.vectorizer.fixed:
+            # Nothing in the example is known yet, so it would teach nothing without a refit
+            self.retrain_model()
+            return
+        if self.user:
+            self.overlay.add(row, [emotion])
+        else:
+            self.model.partial_fit(row, [emotion])
+        self.X = sparse.vstack([self.X, row], format="csr")
+        self.visible_rows = np.append(self.visible_rows, True)
+        self.similarity_index.add(row)
+        self.update_top_words(row)
+    
     def retrain_model(self):
-        self.X = self.vectorizer.fit_transform(self.data["texts"])
-        self.model.fit(self.X, self.data["emotions"])
+        self.vectorizer, self.model, self.X = self.fit_shared_model(self.data)
+        self.build_overlay()
+        # Refitting renumbers the feature columns, so every row is indexed again
+        self.similarity_index.rebuild(self.X)
+    
+    def restore_user_state(self):
+        """Load the student's saved points, badges and challenges"""
+        try:
+            state = load_user_state(self.user["id"])
+        except Exception as e:
+            print(f"Error loading saved progress: {e}")
+            return
+        if not state:
+            return
+        
+        self.points = state["points"] or 0
+        self.progress = state["progress"] or 0
+        self.badges = [badge for badge in (state["badges"] or "").split(",") if badge]
+        for key, saved in json.loads(state["challenges"] or "{}").items():
+            if key in self.challenges:
+                self.challenges[key].update(progress=saved["progress"], completed=saved["completed"])
+        if self.progress >= 100:
+            self.progress_completed = True
+        self.saved_state = self.current_state()
+    
+    def current_state(self):
+        """Gamification state in the form it is saved in"""
+        return {
+            "points": self.points,
+            "progress": self.progress,
+            "badges": ",".join(self.badges),
+            "challenges": json.dumps({
+                key: {"progress": challenge["progress"], "completed": challenge["completed"]}
+                for key, challenge in self.challenges.items()
+            }, sort_keys=True)
+        }
+    
+    def schedule_autosave(self):
+        """Save the state shortly, combining changes from the same burst of clicks"""
+        if self.user and not self.autosave_id:
+            self.autosave_id = self.root.after(AUTOSAVE_SETTINGS["delay_ms"], self.autosave_state)
+    
+    def autosave_state(self):
+        """Write the state columns that changed since the last save"""
+        if self.autosave_id:
+            self.root.after_cancel(self.autosave_id)
+            self.autosave_id = None
+        if not self.user:
+            return
+        
+        state = self.current_state()
+        changes = {key: value for key, value in state.items() if self.saved_state.get(key) != value}
+        if not changes:
+            return
+        try:
+            save_user_state(self.user["id"], changes)
+            self.saved_state = state
+        except Exception as e:
+            print(f"Error saving progress: {e}")
     
     def update_points(self, celebration=False):
         self.points_label.config(text=f"Points: {self.points}")
+        self.schedule_autosave()
         
-        # Add celebration effect if requested
+        # Add celebration effect if requested, with colors only so the page keeps its layout
         if celebration:
-            original_font = self.points_label.cget("font")
-            larger_font = (original_font[0], original_font[1] + 6, original_font[2])
-            self.points_label.config(font=larger_font, fg=COLORS["primary"])
+            self.points_label.config(bg=COLORS["highlight"], fg=COLORS["light_text"])
             self.points_label.after(300, lambda: self.points_label.config(
-                font=original_font, fg=COLORS["text"]))
+                bg="#FFD166", fg=COLORS["text"]))
     
     def update_progress(self):
         self.progress_bar["value"] = min(self.progress, 100)
+        self.schedule_autosave()
         
         # Check for completion
-        if self.progress >= 100 and not hasattr(self, 'progress_completed'):
-            messagebox.showinfo("Congratulations!", "You've completed the training! EmoBot is so happy! 🎉", 
-                              icon=messagebox.INFO)
+        if self.progress >= 100 and not self.progress_completed:
+            self.notifications.notify("Congratulations! You've completed the training! EmoBot is so happy! 🎉")
             self.progress_completed = True
     
-    def update_challenges(self, challenge_key):
-        if not self.challenges[challenge_key]["completed"]:
-            self.challenges[challenge_key]["progress"] += 1
-            
-            # Update challenge display
-            for widget in self.challenge_frame.winfo_children():
-                widget.destroy()
-                
-            # Add challenge title
-            title_label = tk.Label(self.challenge_frame, text="Challenges:", 
-                                  font=FONTS["subtitle"], bg="#FFD166")
-            title_label.pack(pady=5)
+    def update_challenges(self, event):
+        """Count an event towards every unfinished challenge that tracks it; returns their keys"""
+        counted = []
+        for key, challenge in self.challenges.items():
+            if CHALLENGES[key]["event"] != event or challenge["completed"]:
+                continue
+            challenge["progress"] += 1
+            counted.append(key)
+            self.schedule_autosave()
             
-            # Add updated challenge labels
-            for key, challenge in self.challenges.items():
-                # Create frame for each challenge
-                c_frame = tk.Frame(self.challenge_frame, bg="#FFD166")
-                c_frame.pack(fill="x", pady=5)
+            # Check if just completed
+            if challenge["progress"] >= challenge["goal"]:
+                challenge["completed"] = True
                 
-                # Add emoji based on progress
-                emoji = "🔴"  # Not started
-                if challenge["completed"]:
-                    emoji = "✅"  # Completed
-                elif challenge["progress"] > 0:
-                    emoji = "🟡"  # In progress
-                    
-                # Create label
-                c_label = tk.Label(c_frame, 
-                                 text=f"{emoji} {key.replace('_', ' ').title()}: {challenge['progress']}/{challenge['goal']}", 
-                                 font=FONTS["normal"], bg="#FFD166")
-                c_label.pack(pady=2)
+                # Show celebration message
+                self.notifications.notify(f"Challenge Complete! You completed the '{key.replace('_', ' ')}' challenge! 🎉")
                 
-                # Check if just completed
-                if challenge["progress"] >= challenge["goal"] and not challenge["completed"]:
-                    challenge["completed"] = True
-                    
-                    # Show celebration message
-                    messagebox.showinfo("Challenge Complete!", 
-                                      f"You completed the '{key.replace('_', ' ')}' challenge! 🎉", 
-                                      icon=messagebox.INFO)
-                    
-                    # Award bonus points
-                    self.points += 50
-                    self.update_points(celebration=True)
+                # Award bonus points
+                self.points += CHALLENGES[key]["bonus"]
+                self.update_points(celebration=True)
+        
+        # Update challenge display
+        self.challenge_panel.refresh(self.challenges)
+        return counted
+    
+    def revert_challenges(self, keys):
+        """Take one event back from these challenges, with the bonus of any it completed"""
+        for key in keys:
+            challenge = self.challenges[key]
+            # Completed challenges stop counting, so the newest event counted is the one that completed it
+            if challenge["completed"]:
+                challenge["completed"] = False
+                self.points = max(self.points - CHALLENGES[key]["bonus"], 0)
+            challenge["progress"] = max(challenge["progress"] - 1, 0)
+        if keys:
+            self.schedule_autosave()
+            self.challenge_panel.refresh(self.challenges)
     
     def update_storyline(self, message):
         self.storyline.append(message)
         
-        # Update storyline text widget
+        if STORYLINE_SETTINGS["log_history"]:
+            self.event_log.log(self.user["id"] if self.user else None, "story", details=message)
+        
+        # Update storyline text widget, dropping its oldest lines past the limit
         self.storyline_text.config(state="normal")
         self.storyline_text.insert("end", f"\n{message}")
+        line_count = int(self.storyline_text.index("end-1c").split(".")[0])
+        if line_count > STORYLINE_SETTINGS["max_lines"]:
+            self.storyline_text.delete("1.0", f"{line_count - STORYLINE_SETTINGS['max_lines'] + 1}.0")
         self.storyline_text.config(state="disabled")
         self.storyline_text.see("end")  # Scroll to new content
     
@@ -1297,93 +3315,47 @@ class EmotionDetectorApp:
         
         # Add certificate title
         title_label = tk.Label(content_frame, text="Certificate of Achievement", 
-                            font=("Comic Sans MS", 24, "bold"), bg="#FFFFFF", fg=COLORS["primary"])
+                            font=get_font("title"), bg="#FFFFFF", fg=COLORS["primary"])
         title_label.pack(pady=10)
         
         # Add robot character
-        robot_label = tk.Label(content_frame, text="🤖", font=("Arial", 48), bg="#FFFFFF")
+        robot_label = tk.Label(content_frame, text="🤖", font=get_font(("Arial", 48)), bg="#FFFFFF")
         robot_label.pack(pady=10)
         
         # Add personalized message
         name = self.user["first_name"] if self.user else "Explorer"
         message_label = tk.Label(content_frame, 
                               text=f"This certifies that\n{name}\nhas become an\nAI Emotion Detection Expert!", 
-                              font=("Comic Sans MS", 14), bg="#FFFFFF", justify="center")
+                              font=get_font("normal"), bg="#FFFFFF", justify="center")
         message_label.pack(pady=10)
         
         # Add points and badges
         stats_label = tk.Label(content_frame, 
                             text=f"Points earned: {self.points}\nBadges collected: {len(self.badges)}", 
-                            font=("Comic Sans MS", 12), bg="#FFFFFF")
+                            font=get_font("small"), bg="#FFFFFF")
         stats_label.pack(pady=10)
         
         # Add date
         today = datetime.datetime.now().strftime("%B %d, %Y")
         date_label = tk.Label(content_frame, text=f"Date: {today}", 
-                           font=("Comic Sans MS", 12), bg="#FFFFFF")
+                           font=get_font("small"), bg="#FFFFFF")
         date_label.pack(pady=10)
         
         # Save survey responses to the database if we have a user
         if self.user:
+            self.autosave_state()
             self.save_survey_responses()
     
     def save_survey_responses(self):
         """Save survey responses to the database"""
         try:
-            conn = sqlite3.connect('data/users.db')
-            cursor = conn.cursor()
-            
-            # Create survey_responses table if it doesn't exist
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS survey_responses (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER,
-                survey_type TEXT,
-                question TEXT,
-                answer TEXT,
-                submitted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users (id)
-            )
-            ''')
-            
-            # Save pre-survey responses
-            for question, var in self.pre_survey_responses.items():
-                answer = var.get() if isinstance(var, tk.StringVar) else var.get()
-                cursor.execute(
-                    "INSERT INTO survey_responses (user_id, survey_type, question, answer) VALUES (?, ?, ?, ?)",
-                    (self.user['id'], 'pre', question, answer)
-                )
-            
-            # Save post-survey responses
-            for question, var in self.post_survey_responses.items():
-                answer = var.get() if isinstance(var, tk.StringVar) else var.get()
-                cursor.execute(
-                    "INSERT INTO survey_responses (user_id, survey_type, question, answer) VALUES (?, ?, ?, ?)",
-                    (self.user['id'], 'post', question, answer)
-                )
+            answers = []
+            for survey_type, responses in (("pre", self.pre_survey_responses), ("post", self.post_survey_responses)):
+                for question, var in responses.items():
+                    answers.append((survey_type, question, var.get()))
             
-            conn.commit()
-            
-            # Also save user progress data
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS user_progress (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER,
-                points INTEGER,
-                progress INTEGER,
-                badges TEXT,
-                completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users (id)
-            )
-            ''')
-            
-            cursor.execute(
-                "INSERT INTO user_progress (user_id, points, progress, badges) VALUES (?, ?, ?, ?)",
-                (self.user['id'], self.points, self.progress, ','.join(self.badges))
-            )
-            
-            conn.commit()
-            conn.close()
+            # Save the answers and the final progress together
+            save_survey_results(self.user['id'], answers, self.points, self.progress, self.badges)
             
         except Exception as e:
             print(f"Error saving survey responses: {e}")
@@ -1403,7 +3375,7 @@ class DatabaseViewer:
         
         # Create title
         title_label = tk.Label(self.content_frame, text="AI Emotion Detector - Database Viewer", 
-                            font=FONTS["title"], bg=COLORS["background"], fg=COLORS["primary"])
+                            font=get_font("title"), bg=COLORS["background"], fg=COLORS["primary"])
         title_label.pack(pady=10)
         
         # Create table selection frame
@@ -1411,13 +3383,14 @@ class DatabaseViewer:
         selection_frame.pack(fill="x", pady=10)
         
         # Create label
-        table_label = tk.Label(selection_frame, text="Select Table:", font=FONTS["normal"], bg=COLORS["background"])
+        table_label = tk.Label(selection_frame, text="Select Table:", font=get_font("normal"), bg=COLORS["background"])
         table_label.pack(side="left", padx=5)
         
         # Create table selection dropdown
         self.table_var = tk.StringVar()
-        tables = ["users", "sessions", "survey_responses", "user_progress"]
-        table_dropdown = ttk.Combobox(selection_frame, textvariable=self.table_var, values=tables, font=FONTS["normal"], width=20)
+        tables = ["users", "sessions", "survey_responses", "user_progress",
+                  "user_state", "training_examples", "interaction_events", "student_timeline"]
+        table_dropdown = ttk.Combobox(selection_frame, textvariable=self.table_var, values=tables, font=get_font("normal"), width=20)
         table_dropdown.pack(side="left", padx=5)
         table_dropdown.current(0)  # Default to users table
         
@@ -1425,15 +3398,15 @@ class DatabaseViewer:
         button_frame = tk.Frame(selection_frame, bg=COLORS["background"])
         button_frame.pack(side="left", padx=10)
         
-        view_button = tk.Button(button_frame, text="View Table", font=FONTS["normal"], 
+        view_button = tk.Button(button_frame, text="View Table", font=get_font("normal"), 
                               bg=COLORS["secondary"], fg="white", command=self.load_table_data)
         view_button.pack(side="left", padx=5)
         
-        refresh_button = tk.Button(button_frame, text="Refresh Data", font=FONTS["normal"], 
+        refresh_button = tk.Button(button_frame, text="Refresh Data", font=get_font("normal"), 
                                  bg=COLORS["primary"], fg="white", command=self.load_table_data)
         refresh_button.pack(side="left", padx=5)
         
-        export_button = tk.Button(button_frame, text="Export to CSV", font=FONTS["normal"], 
+        export_button = tk.Button(button_frame, text="Export to CSV", font=get_font("normal"), 
                                 bg=COLORS["accent"], fg=COLORS["text"], command=self.export_to_csv)
         export_button.pack(side="left", padx=5)
         
@@ -1456,8 +3429,8 @@ class DatabaseViewer:
                      foreground=COLORS["text"],
                      rowheight=25,
                      fieldbackground="#ffffff",
-                     font=FONTS["small"])
-        style.configure("Treeview.Heading", font=FONTS["normal"], background=COLORS["primary"], foreground="white")
+                     font=get_font("small"))
+        style.configure("Treeview.Heading", font=get_font("normal"), background=COLORS["primary"], foreground="white")
         style.map('Treeview', background=[('selected', COLORS["accent"])])
         
         self.tree = ttk.Treeview(tree_frame, yscrollcommand=y_scrollbar.set, xscrollcommand=x_scrollbar.set)
@@ -1470,7 +3443,7 @@ class DatabaseViewer:
         # Create status bar
         self.status_var = tk.StringVar()
         self.status_var.set("Ready")
-        status_bar = tk.Label(self.content_frame, textvariable=self.status_var, bd=1, relief=tk.SUNKEN, anchor=tk.W, font=FONTS["small"])
+        status_bar = tk.Label(self.content_frame, textvariable=self.status_var, bd=1, relief=tk.SUNKEN, anchor=tk.W, font=get_font("small"))
         status_bar.pack(side="bottom", fill="x")
         
         # Load initial data
@@ -1492,13 +3465,8 @@ class DatabaseViewer:
             for col in self.tree["columns"]:
                 self.tree.heading(col, text="")
             
-            # Connect to database
-            conn = sqlite3.connect('data/users.db')
-            cursor = conn.cursor()
-            
-            # Get column names
-            cursor.execute(f"PRAGMA table_info({table_name})")
-            columns = [col[1] for col in cursor.fetchall()]
+            # Get column names and data
+            columns, rows = read_table(table_name)
             
             # Configure tree columns
             self.tree["columns"] = columns
@@ -1509,10 +3477,6 @@ class DatabaseViewer:
                 self.tree.heading(col, text=col.capitalize())
                 self.tree.column(col, width=150, anchor="center")
             
-            # Get data
-            cursor.execute(f"SELECT * FROM {table_name}")
-            rows = cursor.fetchall()
-            
             # Insert data into tree with alternating row colors
             for i, row in enumerate(rows):
                 tag = "even" if i % 2 == 0 else "odd"
@@ -1522,8 +3486,6 @@ class DatabaseViewer:
             self.tree.tag_configure("even", background="#f0f0f0")
             self.tree.tag_configure("odd", background="#ffffff")
             
-            conn.close()
-            
             self.status_var.set(f"Loaded {len(rows)} records from {table_name}")
         except Exception as e:
             error_msg = f"Error loading data: {str(e)}"
@@ -1538,19 +3500,7 @@ class DatabaseViewer:
             return
         
         try:
-            # Connect to database
-            conn = sqlite3.connect('data/users.db')
-            cursor = conn.cursor()
-            
-            # Get column names
-            cursor.execute(f"PRAGMA table_info({table_name})")
-            columns = [col[1] for col in cursor.fetchall()]
-            
-            # Get data
-            cursor.execute(f"SELECT * FROM {table_name}")
-            rows = cursor.fetchall()
-            
-            conn.close()
+            columns, rows = read_table(table_name)
             
             # Create export directory if it doesn't exist
             if not os.path.exists('exports'):
@@ -1574,11 +3524,216 @@ class DatabaseViewer:
             messagebox.showerror("Export Error", error_msg)
 
 
+class TrainingExamplesViewer:
+    """Teacher list of every saved training example, with removal for moderation"""
+    def __init__(self, parent, app=None):
+        self.parent = parent
+        self.app = app
+        self.window = tk.Toplevel(parent)
+        self.window.title("Training Examples")
+        self.window.geometry("800x500")
+        self.window.configure(bg=COLORS["background"])
+        
+        # Create title
+        title_label = tk.Label(self.window, text="What EmoBot Has Been Taught", 
+                            font=get_font("title"), bg=COLORS["background"], fg=COLORS["primary"])
+        title_label.pack(pady=10)
+        
+        # Create action buttons
+        button_frame = tk.Frame(self.window, bg=COLORS["background"])
+        button_frame.pack(fill="x", pady=5)
+        
+        remove_button = tk.Button(button_frame, text="Remove Selected", font=get_font("normal"), 
+                                bg=COLORS["primary"], fg="white", command=self.remove_selected)
+        remove_button.pack(side="left", padx=5)
+        
+        refresh_button = tk.Button(button_frame, text="Refresh Data", font=get_font("normal"), 
+                                 bg=COLORS["secondary"], fg="white", command=self.load_examples)
+        refresh_button.pack(side="left", padx=5)
+        
+        # Create treeview with a scrollbar
+        tree_frame = tk.Frame(self.window, bg=COLORS["background"])
+        tree_frame.pack(fill="both", expand=True, pady=10, padx=10)
+        
+        y_scrollbar = ttk.Scrollbar(tree_frame)
+        y_scrollbar.pack(side="right", fill="y")
+        
+        columns = ("id", "student", "emotion", "text", "added_at")
+        self.tree = ttk.Treeview(tree_frame, columns=columns, show="headings", 
+                               yscrollcommand=y_scrollbar.set)
+        for col, width in zip(columns, (50, 150, 90, 350, 150)):
+            self.tree.heading(col, text=col.replace("_", " ").capitalize())
+            self.tree.column(col, width=width, anchor="w")
+        self.tree.pack(fill="both", expand=True)
+        y_scrollbar.config(command=self.tree.yview)
+        
+        # Create status bar
+        self.status_var = tk.StringVar()
+        status_bar = tk.Label(self.window, textvariable=self.status_var, bd=1, relief=tk.SUNKEN, 
+                            anchor=tk.W, font=get_font("small"))
+        status_bar.pack(side="bottom", fill="x")
+        
+        self.load_examples()
+    
+    def load_examples(self):
+        """Load the examples, newest first"""
+        try:
+            for item in self.tree.get_children():
+                self.tree.delete(item)
+            
+            conn = connect_db()
+            try:
+                cursor = conn.cursor()
+                cursor.execute('''
+                SELECT t.id, COALESCE(u.first_name || ' ' || u.last_name, 'Teacher'), t.emotion, t.text, t.added_at
+                FROM training_examples t
+                LEFT JOIN users u ON u.id = t.user_id
+                ORDER BY t.id DESC
+                ''')
+                rows = cursor.fetchall()
+            finally:
+                conn.close()
+            
+            for row in rows:
+                self.tree.insert("", "end", iid=str(row[0]), values=row)
+            self.status_var.set(f"Loaded {len(rows)} training examples")
+        except Exception as e:
+            error_msg = f"Error loading training examples: {str(e)}"
+            self.status_var.set(error_msg)
+            messagebox.showerror("Database Error", error_msg)
+    
+    def remove_selected(self):
+        """Remove the selected examples from the database and from the running model"""
+        selected = self.tree.selection()
+        if not selected:
+            self.status_var.set("Please select examples to remove")
+            return
+        
+        try:
+            for item in selected:
+                example_id = int(item)
+                if self.app:
+                    self.app.remove_training_example(example_id)
+                    if example_id in self.app.taught_ids:
+                        self.app.taught_ids.remove(example_id)
+                        self.app.taught_challenges.pop(example_id, None)
+                else:
+                    delete_training_example(example_id)
+            self.load_examples()
+            self.status_var.set(f"Removed {len(selected)} training examples")
+        except Exception as e:
+            error_msg = f"Error removing training examples: {str(e)}"
+            self.status_var.set(error_msg)
+            messagebox.showerror("Database Error", error_msg)
+
+
+class DatabaseBackup:
+    """Takes rotating online snapshots of the database while the app keeps running"""
+    def __init__(self, root, settings=BACKUP_SETTINGS):
+        self.root = root
+        self.settings = settings
+        self.worker = None
+        self.last_result = None
+        self.after_id = None
+
+    def start(self):
+        """Schedule the next periodic backup"""
+        interval_ms = int(self.settings["interval_minutes"] * 60 * 1000)
+        if interval_ms > 0:
+            self.after_id = self.root.after(interval_ms, self._scheduled_backup)
+
+    def stop(self):
+        """Cancel the periodic backups"""
+        if self.after_id:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+
+    def _scheduled_backup(self):
+        self.backup_in_background()
+        self.start()
+
+    def backup_in_background(self, on_done=None):
+        """Run a backup on a worker thread so the window stays responsive"""
+        if self.worker and self.worker.is_alive():
+            return False
+
+        self.worker = threading.Thread(target=self._run_backup, daemon=True)
+        self.worker.start()
+
+        # Tk is not thread safe, so poll for completion from the event loop
+        if on_done:
+            self._wait_for_worker(on_done)
+        return True
+
+    def _wait_for_worker(self, on_done):
+        if self.worker.is_alive():
+            self.root.after(200, lambda: self._wait_for_worker(on_done))
+        else:
+            on_done(self.last_result)
+
+    def _run_backup(self):
+        try:
+            self.last_result = self.backup_now()
+        except Exception as e:
+            self.last_result = e
+            print(f"Error backing up database: {e}")
+
+    def backup_now(self):
+        """Copy the database into a new timestamped snapshot and return its path"""
+        if not MemoryDatabase.active and not os.path.exists(DB_PATH):
+            return None
+
+        directory = self.settings["directory"]
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = os.path.join(directory, f"users_{timestamp}.db")
+        partial_name = filename + ".part"
+
+        # Copy a few pages at a time and pause in between, so the UI and
+        # student writes can take the database lock while the copy runs
+        pause = self.settings["step_pause"]
+
+        def _between_steps(status, remaining, total):
+            if remaining and pause:
+                time.sleep(pause)
+
+        source = connect_db()
+        target = sqlite3.connect(partial_name)
+        try:
+            source.backup(target, pages=self.settings["pages_per_step"], progress=_between_steps)
+        finally:
+            target.close()
+            source.close()
+
+        # Only complete snapshots get the final name
+        os.replace(partial_name, filename)
+        self.rotate_snapshots()
+        return filename
+
+    def rotate_snapshots(self):
+        """Delete the oldest snapshots beyond the configured limit"""
+        directory = self.settings["directory"]
+        snapshots = sorted(
+            name for name in os.listdir(directory)
+            if name.startswith("users_") and name.endswith(".db")
+        )
+        for name in snapshots[:max(len(snapshots) - self.settings["keep"], 0)]:
+            os.remove(os.path.join(directory, name))
+
+
 def main():
     root = tk.Tk()
     root.title("AI Emotion Detector Learning Tool")
     root.geometry("700x600")
     root.configure(bg=COLORS["background"])
+
+    # Load the database into RAM first if the kiosk runs in memory mode
+    memory_database = None
+    if DATABASE_SETTINGS["in_memory"]:
+        memory_database = MemoryDatabase().open()
+        memory_database.start(root)
     
     # Set application icon if available
     try:
@@ -1595,6 +3750,7 @@ def main():
     # Create File menu
     file_menu = tk.Menu(menu_bar, tearoff=0)
     menu_bar.add_cascade(label="File", menu=file_menu)
+    file_menu.add_command(label="Switch User", command=lambda: switch_user())
     file_menu.add_command(label="Exit", command=root.quit)
     
     # Create Admin menu
@@ -1603,24 +3759,642 @@ def main():
     
     # Add Database Viewer option
     admin_menu.add_command(label="Database Viewer", command=lambda: DatabaseViewer(root))
-    
+
+    # Review and remove what students taught EmoBot
+    admin_menu.add_command(label="Training Examples", command=lambda: TrainingExamplesViewer(root, app))
+
+    # Add online backups, scheduled and on demand
+    backup = DatabaseBackup(root)
+
+    def backup_finished(result):
+        if isinstance(result, Exception):
+            messagebox.showerror("Backup Error", f"Error backing up database: {result}")
+        elif result:
+            messagebox.showinfo("Backup Complete", f"Database saved to {result}")
+
+    def backup_database():
+        if not backup.backup_in_background(on_done=backup_finished):
+            messagebox.showinfo("Backup Running", "A backup is already in progress.")
+
+    admin_menu.add_command(label="Backup Database Now", command=backup_database)
+
+    # Combine the databases of other classroom kiosks into this one
+    def merge_classroom_databases():
+        paths = filedialog.askopenfilenames(title="Select classroom databases",
+                                            filetypes=[("SQLite databases", "*.db"), ("All files", "*.*")])
+        if not paths:
+            return
+        try:
+            totals = merge_databases(paths)
+            # Training examples from the other classrooms only count once the model is refit on them
+            if app and totals["training_examples"]:
+                app.reload_training_data()
+            messagebox.showinfo("Merge Complete",
+                                f"Merged {len(paths)} databases: {totals['students']} new students, "
+                                f"{totals['sessions']} sessions, {totals['survey_responses']} survey answers "
+                                f"and {totals['user_progress']} progress records.")
+        except Exception as e:
+            messagebox.showerror("Merge Error", f"Error merging databases: {e}")
+
+    admin_menu.add_command(label="Merge Classroom Databases...", command=merge_classroom_databases)
+
+    # Load many labelled sentences at once, with one retrain at the end
+    def import_training_file():
+        path = filedialog.askopenfilename(title="Select labelled examples",
+                                          filetypes=[("CSV or JSONL files", "*.csv *.jsonl"), ("All files", "*.*")])
+        if not path:
+            return
+        
+        window = tk.Toplevel(root)
+        window.title("Importing Examples")
+        window.configure(bg=COLORS["background"])
+        status = tk.Label(window, text="Reading examples...", font=get_font("normal"),
+                          bg=COLORS["background"], fg=COLORS["text"])
+        status.pack(padx=20, pady=(15, 5))
+        progress_bar = ttk.Progressbar(window, length=300, maximum=1.0)
+        progress_bar.pack(padx=20, pady=(5, 15))
+        
+        # Keep students from teaching EmoBot while the new examples are learned, since
+        # the model fit on the worker thread only has the examples saved when it started
+        window.grab_set()
+        
+        # The import and the refit run on a worker thread; Tk is only touched from the polling loop below
+        job = {"fraction": 0.0, "result": None, "prepared": None, "retraining": False}
+        
+        def run_import():
+            try:
+                job["result"] = import_training_examples(path, EMOTION_EMOJIS.keys(),
+                                                         progress=lambda fraction: job.update(fraction=fraction))
+            except Exception as e:
+                job["result"] = e
+            # Batches committed before an error are saved too, so the app picks them up either way
+            if app and (isinstance(job["result"], Exception) or job["result"]["added"]):
+                job["retraining"] = True
+                try:
+                    job["prepared"] = app.prepare_training_data()
+                except Exception as e:
+                    print(f"Error retraining on imported examples: {e}")
+        
+        worker = threading.Thread(target=run_import, daemon=True)
+        worker.start()
+        
+        def poll():
+            progress_bar["value"] = job["fraction"]
+            if job["retraining"]:
+                status.config(text="EmoBot is learning the new examples...")
+            else:
+                status.config(text=f"Reading examples... {job['fraction']:.0%}")
+            if worker.is_alive():
+                root.after(200, poll)
+                return
+            if job["prepared"]:
+                app.install_training_data(job["prepared"])
+            window.destroy()
+            result = job["result"]
+            if isinstance(result, Exception):
+                messagebox.showerror("Import Error", f"Error importing examples: {result}")
+                return
+            messagebox.showinfo("Import Complete",
+                                f"Added {result['added']} examples. Skipped {result['duplicates']} duplicates "
+                                f"and {result['invalid']} rows that couldn't be read, had no text or "
+                                f"had an unknown emotion.")
+        poll()
+
+    admin_menu.add_command(label="Import Training Examples...", command=import_training_file)
+
     # Add Help menu
     help_menu = tk.Menu(menu_bar, tearoff=0)
     menu_bar.add_cascade(label="Help", menu=help_menu)
     help_menu.add_command(label="About", command=lambda: messagebox.showinfo(
         "About", "AI Emotion Detector Learning Tool\nA fun way for kids to learn about AI!"))
     
+    # Detections and training examples are logged in batches
+    event_log = EventLog(root)
+
+    # One app shell and one trained model are shared by every student on this kiosk
+    app = None
+    
     # Define what happens after successful login
     def after_login(user):
-        # Initialize the main app with the user data
-        app = EmotionDetectorApp(root, user=user)
+        nonlocal app
+        if app is None:
+            # Initialize the main app with the user data
+            app = EmotionDetectorApp(root, user=user, event_log=event_log)
+        else:
+            app.set_user(user)
         app.show()
     
+    # Return to the login page so the next student can sign in
+    def switch_user():
+        if app and app.user:
+            app.logout()
+            auth_system.show_login()
+    
     # Create and show authentication system first
     auth_system = AuthenticationSystem(root, on_successful_login=after_login)
     auth_system.show_login()
-    
+
+    # The database exists once the login page has set it up
+    backup.start()
+
     root.mainloop()
 
+    # Write unsaved progress and buffered events before the database is closed
+    if app:
+        app.autosave_state()
+    event_log.close()
+
+    # Write everything still in RAM to disk before exiting
+    if memory_database:
+        memory_database.close()
+
+def load_corpus(include_saved=True):
+    """The built-in examples plus, optionally, every saved training example"""
+    texts, emotions = list(SEED_DATA["texts"]), list(SEED_DATA["emotions"])
+    if include_saved:
+        try:
+            for example_id, user_id, text, emotion in load_training_examples():
+                texts.append(text)
+                emotions.append(emotion)
+        except Exception as e:
+            print(f"Error loading training examples: {e}")
+    return texts, emotions
+
+def stratified_folds(emotions, folds, seed):
+    """Split example rows into folds that each get a fair share of every emotion"""
+    rng = random.Random(seed)
+    assignment = [0] * len(emotions)
+    offset = 0
+    for emotion in sorted(set(emotions)):
+        rows = [i for i, e in enumerate(emotions) if e == emotion]
+        rng.shuffle(rows)
+        # Continue the round robin where the last emotion stopped, so fold sizes stay even
+        for position, row in enumerate(rows):
+            assignment[row] = (offset + position) % folds
+        offset += len(rows)
+    return assignment
+
+_evaluation_corpus = None
+
+def _init_evaluation_worker(texts, emotions):
+    global _evaluation_corpus
+    _evaluation_corpus = (texts, emotions)
+
+def _evaluate_fold(task):
+    """Train on all folds but one and time predictions on the one left out; runs in a worker process"""
+    backend, feature_changes, assignment, fold = task
+    texts, emotions = _evaluation_corpus
+    train = [i for i, f in enumerate(assignment) if f != fold]
+    test = [i for i, f in enumerate(assignment) if f == fold]
+    
+    # Created before timing, so scikit-learn's first import isn't counted as fit time
+    pipeline = FeaturePipeline(dict(FEATURE_SETTINGS, **feature_changes))
+    model = CLASSIFIER_BACKENDS[backend]()
+    start = time.perf_counter()
+    model.fit(pipeline.fit_transform([texts[i] for i in train]), [emotions[i] for i in train])
+    fit_ms = (time.perf_counter() - start) * 1000
+    
+    # Predict one text at a time, the way the app does
+    predictions, latencies = [], []
+    for i in test:
+        start = time.perf_counter()
+        probabilities = model.predict_proba(pipeline.transform([texts[i]]))[0]
+        predictions.append(str(model.classes_[int(np.argmax(probabilities))]))
+        latencies.append((time.perf_counter() - start) * 1000)
+    return [emotions[i] for i in test], predictions, fit_ms, latencies
+
+def evaluate_models(texts, emotions, settings=EVALUATION_SETTINGS, workers=None):
+    """
+    Stratified k-fold cross-validation of every backend and feature setting
+    Folds run in a process pool; returns one result dictionary per configuration
+    """
+    smallest = min(collections.Counter(emotions).values())
+    folds = min(settings["folds"], smallest)
+    if folds < 2:
+        raise ValueError("Every emotion needs at least 2 examples for cross-validation")
+    assignment = stratified_folds(emotions, folds, settings["seed"])
+    configurations = [(backend, name) for backend in settings["backends"] for name in settings["features"]]
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_evaluation_worker,
+                             initargs=(texts, emotions)) as pool:
+        futures = {
+            configuration: [pool.submit(_evaluate_fold, (configuration[0], settings["features"][configuration[1]],
+                                                         assignment, fold))
+                            for fold in range(folds)]
+            for configuration in configurations
+        }
+        
+        results = []
+        labels = sorted(set(emotions))
+        for (backend, name), fold_futures in futures.items():
+            result = {"backend": backend, "features": name, "folds": folds, "examples": len(texts)}
+            try:
+                outcomes = [future.result() for future in fold_futures]
+            except Exception as e:
+                # e.g. scikit-learn missing on this machine
+                result["error"] = str(e)
+                results.append(result)
+                continue
+            
+            actual = [emotion for outcome in outcomes for emotion in outcome[0]]
+            predicted = [emotion for outcome in outcomes for emotion in outcome[1]]
+            latencies = np.array([latency for outcome in outcomes for latency in outcome[3]])
+            confusion = {label: {guess: 0 for guess in labels} for label in labels}
+            for truth, guess in zip(actual, predicted):
+                confusion[truth][guess] += 1
+            
+            result.update({
+                "accuracy": sum(a == p for a, p in zip(actual, predicted)) / len(actual),
+                "confusion_matrix": confusion,  # Actual emotion -> guessed emotion -> count
+                "fit_ms": sum(outcome[2] for outcome in outcomes) / folds,
+                "predict_p50_ms": float(np.percentile(latencies, 50)),
+                "predict_p99_ms": float(np.percentile(latencies, 99))
+            })
+            results.append(result)
+    return results
+
+def synthetic_corpus(size, seed):
+    """
+    The built-in examples plus made-up sentences up to size examples
+    Each sentence mixes words of its emotion's built-in examples with rarer words,
+    so the vocabulary keeps growing with the corpus like real student input
+    """
+    rng = random.Random(seed)
+    texts, emotions = list(SEED_DATA["texts"])[:size], list(SEED_DATA["emotions"])[:size]
+    emotion_words = collections.defaultdict(list)
+    for text, emotion in zip(SEED_DATA["texts"], SEED_DATA["emotions"]):
+        emotion_words[emotion].extend(re.findall(r"\w+", text.lower()))
+    labels = sorted(emotion_words)
+    while len(texts) < size:
+        emotion = rng.choice(labels)
+        words = rng.choices(emotion_words[emotion], k=rng.randint(3, 8))
+        words += [f"word{int(rng.paretovariate(1.2) * 10)}" for _ in range(rng.randint(1, 4))]
+        rng.shuffle(words)
+        texts.append(" ".join(words))
+        emotions.append(emotion)
+    return texts, emotions
+
+def time_runs(function, repeats):
+    """Run function repeats times and return its median and fastest time"""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        times.append((time.perf_counter() - start) * 1000)
+    return {"median_ms": float(np.median(times)), "min_ms": min(times), "runs": repeats}
+
+def fill_benchmark_database(students, seed, connect=connect_db):
+    """Fill the current database with students, sessions, survey answers, progress and events"""
+    rng = random.Random(seed)
+    conn = connect()
+    try:
+        cursor = conn.cursor()
+        create_tables(cursor)
+        cursor.executemany("INSERT INTO users (first_name, last_name, grade) VALUES (?, ?, ?)",
+                           [(f"First{i}", f"Last{i}", str(rng.randint(1, 6))) for i in range(students)])
+        user_ids = range(1, students + 1)
+        cursor.executemany("INSERT INTO sessions (user_id, login_time) VALUES (?, ?)",
+                           [(user_id, datetime.datetime.now()) for user_id in user_ids for _ in range(2)])
+        cursor.executemany(
+            "INSERT INTO survey_responses (user_id, survey_type, question, answer) VALUES (?, ?, ?, ?)",
+            [(user_id, survey_type, f"Question {q}", "Yes") for user_id in user_ids
+             for survey_type in ("pre", "post") for q in range(5)])
+        cursor.executemany("INSERT INTO user_progress (user_id, points, progress, badges) VALUES (?, ?, ?, ?)",
+                           [(user_id, rng.randint(0, 300), 100, "AI Expert") for user_id in user_ids])
+        cursor.executemany(
+            "INSERT INTO interaction_events (user_id, event_time, action, emotion, confidence, latency_ms) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [(user_id, datetime.datetime.now(), "detect", "happy", 0.5, 1.0)
+             for user_id in user_ids for _ in range(5)])
+        conn.commit()
+    finally:
+        conn.close()
+
+def run_benchmarks(settings=BENCHMARK_SETTINGS, quick=False):
+    """Time the model and database hot paths headless; returns benchmark name -> timings"""
+    results = {}
+    limit = settings["quick_limit"] if quick else float("inf")
+    repeats = settings["repeats"]
+    
+    for size in [size for size in settings["corpus_sizes"] if size <= limit]:
+        texts, emotions = synthetic_corpus(size, settings["seed"])
+        pipeline = FeaturePipeline()
+        model = CLASSIFIER_BACKENDS[MODEL_SETTINGS["backend"]]()
+        
+        fitted = {}
+        def fit():
+            fitted["X"] = pipeline.fit_transform(texts)
+            model.fit(fitted["X"], emotions)
+        results[f"fit/{size}"] = time_runs(fit, settings["fit_repeats"])
+        
+        # Adding one example to a student's overlay, with everything learn_example updates:
+        # the training rows, the similarity index and the Emotion Guide's top words
+        X = fitted["X"]
+        overlay = StudentOverlay(model.classes_, X.shape[1])
+        similarity_index = SimilarityIndex(X)
+        top_words = TopWordsIndex()
+        top_words.rebuild(model.feature_count_, model.alpha)
+        new_text, new_emotion = "I am so happy about my new puppy", "happy"
+        def add_example():
+            nonlocal X
+            row = pipeline.transform([new_text])
+            overlay.add(row, [new_emotion])
+            X = sparse.vstack([X, row], format="csr")
+            similarity_index.add(row)
+            columns = np.unique(row.indices)
+            top_words.update(columns, model.feature_count_[:, columns] + overlay.feature_count[:, columns].toarray())
+        results[f"add_example/{size}"] = time_runs(add_example, max(repeats // 10, 1))
+        
+        sentence = "Wow, I am so excited and a little scared about the trip!"
+        results[f"predict_single/{size}"] = time_runs(
+            lambda: model.predict_proba(pipeline.transform([sentence])), repeats)
+        batch = texts[:settings["batch_size"]]
+        results[f"predict_batch/{size}"] = time_runs(
+            lambda: model.predict_proba(pipeline.transform(batch)), max(repeats // 10, 1))
+        
+        # What explain_ai_process and visualize_word_importance compute for one guess
+        text_vec = pipeline.transform([sentence])
+        def explain():
+            pipeline.feature_names(sentence, np.sort(text_vec.indices))
+            names = pipeline.feature_names(sentence, text_vec.indices)
+            contributions = model.token_contributions(text_vec, 0)
+            sorted(zip(names, contributions), key=lambda x: x[1], reverse=True)[:5]
+        results[f"explain/{size}"] = time_runs(explain, repeats)
+    
+    with tempfile.TemporaryDirectory() as directory:
+        for students in [size for size in settings["db_sizes"] if size <= limit]:
+            connect = functools.partial(connect_db, os.path.join(directory, f"users_{students}.db"))
+            fill_benchmark_database(students, settings["seed"], connect)
+            rng = random.Random(settings["seed"])
+            
+            def login():
+                i = rng.randrange(students)
+                conn = connect()
+                first_name, last_name, grade = conn.execute(
+                    "SELECT first_name, last_name, grade FROM users WHERE id = ?", (i + 1,)).fetchone()
+                conn.close()
+                login_user(first_name, last_name, grade, connect)
+            results[f"login/{students}"] = time_runs(login, repeats)
+            
+            answers = [(survey_type, f"Question {q}", "Yes") for survey_type in ("pre", "post") for q in range(5)]
+            results[f"save_survey/{students}"] = time_runs(
+                lambda: save_survey_results(rng.randint(1, students), answers, 120, 100, ["AI Expert"], connect),
+                repeats)
+            
+            for table in ("users", "survey_responses", "student_timeline"):
+                results[f"viewer/{table}/{students}"] = time_runs(
+                    lambda: read_table(table, connect), max(repeats // 20, 3))
+    return results
+
+def compare_benchmarks(results, baseline, settings=BENCHMARK_SETTINGS):
+    """Return (name, baseline ms, current ms) for every benchmark that got slower than the settings allow"""
+    regressions = []
+    for name, timing in results.items():
+        before = baseline.get(name)
+        if (before and timing["median_ms"] > before["median_ms"] * (1 + settings["tolerance"])
+                and timing["median_ms"] - before["median_ms"] >= settings["min_difference_ms"]):
+            regressions.append((name, before["median_ms"], timing["median_ms"]))
+    return regressions
+
+def run_with_retry(function, *args, **kwargs):
+    """
+    Run a database call, retrying while another process holds the lock
+    Returns the call's result and the milliseconds spent waiting for the lock
+    """
+    waited_ms = 0.0
+    delay = 0.001
+    while True:
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs), waited_ms
+        except sqlite3.OperationalError as e:
+            if "locked" not in str(e) and "busy" not in str(e):
+                raise
+        time.sleep(delay)
+        delay = min(delay * 2, 0.05)
+        waited_ms += (time.perf_counter() - start) * 1000
+
+def simulate_student(task):
+    """
+    One simulated student in its own process: log in, detect, teach, autosave and answer the survey,
+    session after session with think times, until the deadline
+    Returns (operation, latency ms, lock wait ms) for every database operation
+    """
+    student, db_path, barrier, settings = task
+    # Fail fast on a held lock, so run_with_retry can measure the wait
+    connect = functools.partial(connect_db, db_path, timeout=0)
+    rng = random.Random(settings["seed"] + student)
+    
+    pipeline = FeaturePipeline()
+    model = CLASSIFIER_BACKENDS[MODEL_SETTINGS["backend"]]()
+    model.fit(pipeline.fit_transform(SEED_DATA["texts"]), SEED_DATA["emotions"])
+    sentences, labels = synthetic_corpus(500, settings["seed"] + student)
+    actions, weights = zip(*settings["mix"].items())
+    
+    samples = []
+    def measure(operation, function, *args):
+        start = time.perf_counter()
+        result, waited_ms = run_with_retry(function, *args, connect=connect)
+        samples.append((operation, (time.perf_counter() - start) * 1000, waited_ms))
+        return result
+    
+    def think():
+        # No think time at all is a stress test
+        if settings["think_seconds"] > 0:
+            time.sleep(min(rng.expovariate(1 / settings["think_seconds"]), max(deadline - time.time(), 0)))
+    
+    # Every student starts at the same moment, once all of them are ready
+    barrier.wait()
+    deadline = time.time() + settings["duration_seconds"]
+    while time.time() < deadline:
+        user_id = measure("login", login_user, f"Load{student}", "Student", str(student % 6 + 1))
+        points, events = 0, []
+        for _ in range(rng.randint(*settings["actions_per_session"])):
+            think()
+            if time.time() >= deadline:
+                break
+            action = rng.choices(actions, weights)[0]
+            i = rng.randrange(len(sentences))
+            if action == "detect":
+                # Guesses are logged in batches, like EventLog does
+                probabilities = model.predict_proba(pipeline.transform([sentences[i]]))[0]
+                events.append((user_id, datetime.datetime.now().isoformat(" "), "detect", None,
+                               str(model.classes_[int(np.argmax(probabilities))]),
+                               float(probabilities.max()), None, None))
+                if len(events) >= EVENT_LOG_SETTINGS["batch_size"]:
+                    measure("write_events", write_events, events)
+                    events = []
+                points += 10
+            elif action == "train":
+                measure("train", insert_training_example, user_id, sentences[i], labels[i])
+                points += 20
+            else:
+                measure("save_state", save_user_state, user_id, {"points": points})
+        if events:
+            measure("write_events", write_events, events)
+        answers = [(survey_type, f"Question {q}", "Yes") for survey_type in ("pre", "post") for q in range(5)]
+        measure("survey", save_survey_results, user_id, answers, points, 100, ["AI Expert"])
+    return samples
+
+def run_load_test(db_path, settings=LOAD_TEST_SETTINGS):
+    """Run every simulated student at once against one database; returns a report per operation"""
+    conn = sqlite3.connect(db_path)
+    try:
+        create_tables(conn.cursor())
+        conn.commit()
+    finally:
+        conn.close()
+    
+    with multiprocessing.Manager() as manager, ProcessPoolExecutor(max_workers=settings["students"]) as pool:
+        barrier = manager.Barrier(settings["students"])
+        futures = [pool.submit(simulate_student, (student, db_path, barrier, settings))
+                   for student in range(settings["students"])]
+        samples = [sample for future in futures for sample in future.result()]
+    
+    report = {}
+    for operation in sorted({sample[0] for sample in samples}):
+        latencies = np.array([sample[1] for sample in samples if sample[0] == operation])
+        waits = np.array([sample[2] for sample in samples if sample[0] == operation])
+        report[operation] = {
+            "count": len(latencies),
+            "per_second": len(latencies) / settings["duration_seconds"],
+            "p50_ms": float(np.percentile(latencies, 50)),
+            "p99_ms": float(np.percentile(latencies, 99)),
+            "lock_wait_total_ms": float(waits.sum()),
+            "lock_wait_p99_ms": float(np.percentile(waits, 99)),
+            "waited_share": float((waits > 0).mean())   # Share of calls that found the database locked
+        }
+    return report
+
+def run_command(argv):
+    """Run a command-line admin task instead of the app"""
+    parser = argparse.ArgumentParser(prog="EmoBot.py", description="AI Emotion Detector admin commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    merge_parser = commands.add_parser("merge", help="merge classroom databases into one")
+    merge_parser.add_argument("sources", nargs="+", help="databases to merge in")
+    merge_parser.add_argument("--target", default=DB_PATH, help="database to merge into")
+
+    evaluate_parser = commands.add_parser("evaluate", help="cross-validate every backend and feature setting")
+    evaluate_parser.add_argument("--output", default="evaluation.json", help="JSON file for the results")
+    evaluate_parser.add_argument("--folds", type=int, default=EVALUATION_SETTINGS["folds"])
+    evaluate_parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    evaluate_parser.add_argument("--seed-only", action="store_true",
+                                 help="use only the built-in examples, not the ones students saved")
+
+    import_parser = commands.add_parser("import", help="add labelled examples from a CSV or JSONL file")
+    import_parser.add_argument("path", help="file with text and emotion columns (CSV) or keys (JSONL)")
+
+    benchmark_parser = commands.add_parser("benchmark", help="time the model and database hot paths")
+    benchmark_parser.add_argument("--output", default="benchmark.json", help="JSON file for the results")
+    benchmark_parser.add_argument("--baseline", default=BENCHMARK_SETTINGS["baseline"],
+                                  help="results to compare against; created by the first run")
+    benchmark_parser.add_argument("--save-baseline", action="store_true", help="replace the baseline with this run")
+    benchmark_parser.add_argument("--quick", action="store_true",
+                                  help=f"skip sizes above {BENCHMARK_SETTINGS['quick_limit']}")
+
+    load_parser = commands.add_parser("loadtest", help="simulate a classroom of students on one database")
+    load_parser.add_argument("--db", default="data/loadtest.db", help="database to load; use a copy, not the real one")
+    load_parser.add_argument("--students", type=int, default=LOAD_TEST_SETTINGS["students"])
+    load_parser.add_argument("--duration", type=float, default=LOAD_TEST_SETTINGS["duration_seconds"], help="seconds")
+    load_parser.add_argument("--think", type=float, default=LOAD_TEST_SETTINGS["think_seconds"],
+                             help="average seconds between a student's actions (0 for a stress test)")
+    load_parser.add_argument("--output", default="loadtest.json", help="JSON file for the results")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "merge":
+        start = time.perf_counter()
+        totals = merge_databases(args.sources, target_path=args.target)
+        elapsed = time.perf_counter() - start
+        print(f"Merged {len(args.sources)} databases into {args.target} in {elapsed:.2f}s")
+        for table, count in totals.items():
+            print(f"  {table}: {count} added")
+    elif args.command == "import":
+        start = time.perf_counter()
+        if not os.path.exists(os.path.dirname(DB_PATH)):
+            os.makedirs(os.path.dirname(DB_PATH))
+        
+        shown = {"tenths": 0}
+        def report(fraction):
+            # Print every 10% so long imports show they're moving
+            if int(fraction * 10) > shown["tenths"]:
+                shown["tenths"] = int(fraction * 10)
+                print(f"  {shown['tenths'] * 10}% read")
+        
+        totals = import_training_examples(args.path, EMOTION_EMOJIS.keys(), progress=report)
+        print(f"Imported {args.path} in {time.perf_counter() - start:.2f}s: {totals['added']} added, "
+              f"{totals['duplicates']} duplicates, {totals['invalid']} invalid")
+    elif args.command == "benchmark":
+        start = time.perf_counter()
+        results = run_benchmarks(quick=args.quick)
+        report = {
+            "created_at": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "backend": MODEL_SETTINGS["backend"],
+            "features": FEATURE_SETTINGS["mode"],
+            "results": results
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Ran {len(results)} benchmarks in {time.perf_counter() - start:.1f}s, results in {args.output}")
+        for name, timing in results.items():
+            print(f"  {name:32} {timing['median_ms']:10.3f} ms")
+        
+        if args.save_baseline or not os.path.exists(args.baseline):
+            if os.path.dirname(args.baseline) and not os.path.exists(os.path.dirname(args.baseline)):
+                os.makedirs(os.path.dirname(args.baseline))
+            with open(args.baseline, "w") as f:
+                json.dump(report, f, indent=2)
+            print(f"Saved as the baseline in {args.baseline}")
+            return
+        
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if (baseline.get("backend"), baseline.get("features")) != (report["backend"], report["features"]):
+            print(f"Note: the baseline used {baseline.get('backend')} with {baseline.get('features')} features")
+        regressions = compare_benchmarks(results, baseline["results"])
+        if regressions:
+            print(f"{len(regressions)} regressions against {args.baseline}:")
+            for name, before, now in regressions:
+                print(f"  {name:32} {before:10.3f} ms -> {now:.3f} ms ({now / before:.1f}x)")
+            sys.exit(1)
+        print(f"No regressions against {args.baseline}")
+    elif args.command == "loadtest":
+        if os.path.dirname(args.db) and not os.path.exists(os.path.dirname(args.db)):
+            os.makedirs(os.path.dirname(args.db))
+        settings = dict(LOAD_TEST_SETTINGS, students=args.students, duration_seconds=args.duration,
+                        think_seconds=args.think)
+        report = run_load_test(args.db, settings)
+        with open(args.output, "w") as f:
+            json.dump({"created_at": datetime.datetime.now().isoformat(timespec="seconds"),
+                       "settings": settings, "operations": report}, f, indent=2)
+        print(f"{args.students} students for {args.duration:g}s on {args.db}, results in {args.output}")
+        print(f"  {'operation':14} {'count':>7} {'per s':>8} {'p50 ms':>8} {'p99 ms':>8} "
+              f"{'lock wait ms':>13} {'waited':>7}")
+        for operation, stats in report.items():
+            print(f"  {operation:14} {stats['count']:7} {stats['per_second']:8.1f} {stats['p50_ms']:8.2f} "
+                  f"{stats['p99_ms']:8.2f} {stats['lock_wait_total_ms']:13.1f} {stats['waited_share']:7.1%}")
+    elif args.command == "evaluate":
+        texts, emotions = load_corpus(include_saved=not args.seed_only)
+        start = time.perf_counter()
+        results = evaluate_models(texts, emotions, dict(EVALUATION_SETTINGS, folds=args.folds), args.workers)
+        with open(args.output, "w") as f:
+            json.dump({"created_at": datetime.datetime.now().isoformat(timespec="seconds"),
+                       "results": results}, f, indent=2)
+        print(f"Evaluated {len(results)} configurations on {len(texts)} examples "
+              f"in {time.perf_counter() - start:.2f}s, results in {args.output}")
+        for result in results:
+            if "error" in result:
+                print(f"  {result['backend']:8} {result['features']:16} error: {result['error']}")
+            else:
+                print(f"  {result['backend']:8} {result['features']:16} accuracy {result['accuracy']:.1%}  "
+                      f"fit {result['fit_ms']:.1f} ms  predict p50 {result['predict_p50_ms']:.2f} ms  "
+                      f"p99 {result['predict_p99_ms']:.2f} ms")
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if len(sys.argv) > 1:
+        run_command(sys.argv[1:])
+    else:
+        main()
\ No newline at end of file
@@ -0,0 +1,153 @@
+"""Every classifier backend must give the same results and pass the same accuracy and latency checks"""
+import time
+
+import numpy as np
+import pytest
+
+import EmoBot
+
+BACKENDS = sorted(EmoBot.CLASSIFIER_BACKENDS)
+FEATURE_MODES = ["tfidf", "hashing", "numpy"]
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    return EmoBot.synthetic_corpus(10000, seed=7)
+
+
+def pipeline(mode):
+    return EmoBot.FeaturePipeline(dict(EmoBot.FEATURE_SETTINGS, mode=mode))
+
+
+def fit(backend, X, emotions):
+    return EmoBot.CLASSIFIER_BACKENDS[backend]().fit(X, emotions)
+
+
+@pytest.mark.parametrize("mode", FEATURE_MODES)
+def test_backends_give_the_same_probabilities(corpus, mode):
+    texts, emotions = corpus
+    features = pipeline(mode)
+    X = features.fit_transform(texts)
+    queries = features.transform(texts[:500] + ["I am so excited and a little scared!", "zzz qqq"])
+
+    sklearn_model, numpy_model = fit("sklearn", X, emotions), fit("numpy", X, emotions)
+    assert list(sklearn_model.classes_) == list(numpy_model.classes_)
+    np.testing.assert_allclose(numpy_model.feature_log_prob_, sklearn_model.feature_log_prob_, rtol=0, atol=1e-12)
+    np.testing.assert_allclose(numpy_model.predict_proba(queries), sklearn_model.predict_proba(queries),
+                               rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_adding_rows_matches_a_refit(corpus, backend):
+    texts, emotions = corpus
+    X = pipeline("numpy").fit_transform(texts)
+
+    model = fit(backend, X[:9000], emotions[:9000])
+    model.partial_fit(X[9000:], emotions[9000:])
+    refit = fit(backend, X, emotions)
+
+    np.testing.assert_allclose(model.class_count_, refit.class_count_)
+    np.testing.assert_allclose(model.predict_proba(X[:200]), refit.predict_proba(X[:200]), rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_negative_weight_takes_an_example_back_out(corpus, backend):
+    texts, emotions = corpus
+    X = pipeline("numpy").fit_transform(texts)
+    removed = [3, 500, 9999]
+    kept = [row for row in range(len(texts)) if row not in removed]
+
+    model = fit(backend, X, emotions)
+    model.partial_fit(X[removed], [emotions[row] for row in removed], sample_weight=[-1.0] * len(removed))
+    refit = fit(backend, X[kept], [emotions[row] for row in kept])
+
+    np.testing.assert_allclose(model.feature_count_, refit.feature_count_, rtol=0, atol=1e-9)
+    np.testing.assert_allclose(model.class_count_, refit.class_count_)
+    np.testing.assert_allclose(model.predict_proba(X[:200]), refit.predict_proba(X[:200]), rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_a_student_overlay_matches_a_refit(corpus, backend):
+    texts, emotions = corpus
+    X = pipeline("numpy").fit_transform(texts)
+    queries = X[:200]
+
+    base = fit(backend, X[:9000], emotions[:9000])
+    overlay = EmoBot.StudentOverlay(base.classes_, X.shape[1])
+    overlay.add(X[9000:], emotions[9000:])
+    refit = fit(backend, X, emotions)
+    np.testing.assert_allclose(base.predict_proba(queries, overlay), refit.predict_proba(queries),
+                               rtol=0, atol=1e-12)
+    np.testing.assert_allclose(base.token_contributions(X[9500], 0, overlay), refit.token_contributions(X[9500], 0),
+                               rtol=0, atol=1e-9)
+
+    # Taking some of the student's examples back out matches a refit without them
+    overlay.add(X[9500:], emotions[9500:], weight=-1)
+    refit = fit(backend, X[:9500], emotions[:9500])
+    np.testing.assert_allclose(base.predict_proba(queries, overlay), refit.predict_proba(queries),
+                               rtol=0, atol=1e-12)
+
+    # And taking all of them out leaves the shared model
+    overlay.add(X[9000:9500], emotions[9000:9500], weight=-1)
+    assert overlay.empty
+    assert overlay.feature_count.nnz == 0
+    np.testing.assert_allclose(base.predict_proba(queries, overlay), base.predict_proba(queries), rtol=0, atol=1e-12)
+
+
+def test_updated_top_words_match_a_rebuild(corpus):
+    texts, emotions = corpus
+    X = pipeline("tfidf").fit_transform(texts)
+    model = fit("numpy", X[:5000], emotions[:5000])
+    counts = model.feature_count_.copy()
+    top_words = EmoBot.TopWordsIndex()
+    top_words.rebuild(counts, model.alpha)
+
+    # Add examples one at a time and take some back out, the way students teach and undo
+    rng = np.random.default_rng(7)
+    for row in rng.choice(np.arange(5000, len(texts)), 300, replace=False):
+        weight = -1.0 if rng.random() < 0.3 else 1.0
+        source = rng.integers(5000) if weight < 0 else row
+        columns = X[source].indices
+        counts[np.searchsorted(model.classes_, emotions[source]), columns] += weight * X[source].data
+        if not top_words.update(columns, counts[:, columns]):
+            top_words.rebuild(counts, model.alpha)
+
+    rebuilt = EmoBot.TopWordsIndex()
+    rebuilt.rebuild(counts, model.alpha)
+    scores = rebuilt.scores(counts)
+    for class_index in range(len(model.classes_)):
+        # Compare scores, not columns, since words with equal counts can be listed in either order
+        np.testing.assert_allclose(scores[class_index, top_words.top(class_index)],
+                                   scores[class_index, rebuilt.top(class_index)], rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize("mode", FEATURE_MODES)
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_accuracy_on_held_out_examples(corpus, backend, mode):
+    texts, emotions = corpus
+    folds = EmoBot.stratified_folds(emotions, 5, seed=7)
+    train = [row for row, fold in enumerate(folds) if fold != 0]
+    test = [row for row, fold in enumerate(folds) if fold == 0]
+    features = pipeline(mode)
+
+    model = fit(backend, features.fit_transform([texts[row] for row in train]), [emotions[row] for row in train])
+    guesses = model.classes_[model.predict_proba(features.transform([texts[row] for row in test])).argmax(axis=1)]
+
+    assert np.mean(guesses == np.array([emotions[row] for row in test])) >= 0.9
+
+
+@pytest.mark.parametrize("mode", FEATURE_MODES)
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_single_guess_latency(corpus, backend, mode):
+    texts, emotions = corpus
+    features = pipeline(mode)
+    model = fit(backend, features.fit_transform(texts), emotions)
+
+    # One text at a time, the way the app guesses
+    latencies = []
+    for text in texts[:300]:
+        start = time.perf_counter()
+        model.predict_proba(features.transform([text]))
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    assert np.median(latencies) < 10
@@ -0,0 +1,23 @@
+"""Importing labelled examples must skip only the examples the shared model already has"""
+import functools
+
+import EmoBot
+
+
+def test_a_students_example_is_still_imported_for_everyone(tmp_path):
+    connect = functools.partial(EmoBot.connect_db, str(tmp_path / "classroom.db"))
+    conn = connect()
+    EmoBot.create_tables(conn.cursor())
+    conn.close()
+    student_id = EmoBot.login_user("Ada", "Smith", "4", connect=connect)
+    EmoBot.insert_training_example(student_id, "recess is awesome", "happy", connect=connect)
+    path = tmp_path / "examples.csv"
+    path.write_text("text,emotion\nRecess is awesome!,happy\nrecess is awesome,happy\n", encoding="utf-8")
+
+    totals = EmoBot.import_training_examples(str(path), EmoBot.EMOTION_EMOJIS.keys(), connect=connect)
+    assert totals == {"added": 1, "duplicates": 1, "invalid": 0}
+
+    # Importing the same file for that student adds nothing, since they already taught it
+    totals = EmoBot.import_training_examples(str(path), EmoBot.EMOTION_EMOJIS.keys(), user_id=student_id,
+                                             connect=connect)
+    assert totals == {"added": 0, "duplicates": 2, "invalid": 0}
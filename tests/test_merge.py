@@ -0,0 +1,89 @@
+"""Merging classroom databases must keep every student's data and be safe to repeat"""
+import functools
+import sqlite3
+
+import pytest
+
+import EmoBot
+
+TABLES = ["users", "sessions", "survey_responses", "user_progress", "interaction_events", "training_examples"]
+
+
+def row_counts(path):
+    conn = sqlite3.connect(path)
+    try:
+        return {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in TABLES}
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def classroom(tmp_path):
+    path = str(tmp_path / "classroom.db")
+    connect = functools.partial(EmoBot.connect_db, path)
+    EmoBot.fill_benchmark_database(5, seed=3, connect=connect)
+    EmoBot.insert_training_example(1, "recess is awesome", "happy", connect=connect)
+    EmoBot.insert_training_example(None, "thunder is scary", "scared", connect=connect)
+    return path
+
+
+def test_merging_the_same_file_twice_adds_nothing(tmp_path, classroom):
+    target = str(tmp_path / "target.db")
+    first = EmoBot.merge_databases([classroom], target)
+    assert first["students"] == 5
+    assert first["training_examples"] == 2
+    counts = row_counts(target)
+
+    second = EmoBot.merge_databases([classroom], target)
+    assert all(added == 0 for added in second.values())
+    assert row_counts(target) == counts
+
+
+def classroom_with_state(path, states):
+    """A classroom database with one student per (first name, points, updated_at)"""
+    conn = sqlite3.connect(path)
+    try:
+        EmoBot.create_tables(conn.cursor())
+        for first_name, points, updated_at in states:
+            user_id = conn.execute("INSERT INTO users (first_name, last_name, grade) VALUES (?, 'Smith', '4')",
+                                   (first_name,)).lastrowid
+            conn.execute("INSERT INTO user_state (user_id, points, progress, badges, challenges, updated_at) "
+                         "VALUES (?, ?, 50, 'Explorer', '{}', ?)", (user_id, points, updated_at))
+        conn.commit()
+    finally:
+        conn.close()
+    return path
+
+
+def test_merged_state_is_the_most_recent_one(tmp_path):
+    newer = classroom_with_state(str(tmp_path / "newer.db"), [("Ada", 40, "2026-01-02 09:00:00"),
+                                                              ("Ben", 5, "2026-01-01 09:00:00")])
+    older = classroom_with_state(str(tmp_path / "older.db"), [("Cal", 7, "2026-01-01 09:00:00"),
+                                                              ("Ada", 10, "2026-01-01 09:00:00")])
+    target = str(tmp_path / "target.db")
+
+    totals = EmoBot.merge_databases([newer, older], target)
+    assert totals["user_state"] == 3
+    assert EmoBot.merge_databases([newer, older], target)["user_state"] == 0
+
+    connect = functools.partial(EmoBot.connect_db, target)
+    conn = connect()
+    try:
+        ids = dict(conn.execute("SELECT first_name, id FROM users"))
+    finally:
+        conn.close()
+    assert EmoBot.load_user_state(ids["Ada"], connect=connect)["points"] == 40
+    assert EmoBot.load_user_state(ids["Ben"], connect=connect)["points"] == 5
+    assert EmoBot.load_user_state(ids["Cal"], connect=connect) == {
+        "points": 7, "progress": 50, "badges": "Explorer", "challenges": "{}"}
+
+    # The same result when the newer database is merged last
+    reversed_target = str(tmp_path / "reversed.db")
+    EmoBot.merge_databases([older, newer], reversed_target)
+    connect = functools.partial(EmoBot.connect_db, reversed_target)
+    conn = connect()
+    try:
+        ada = conn.execute("SELECT id FROM users WHERE first_name = 'Ada'").fetchone()[0]
+    finally:
+        conn.close()
+    assert EmoBot.load_user_state(ada, connect=connect)["points"] == 40